@@ -11,24 +11,75 @@ User inputs current RLLR (base rate). The app supports single applicant entry an
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import math
+import json
 from dataclasses import dataclass, asdict
 from typing import Optional, Dict, Tuple
+from functools import lru_cache
+from io import BytesIO
+
+try:
+    from numba import njit, prange, vectorize, float64, int64
+    _NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; everything below has a plain Python/NumPy path
+    _NUMBA_AVAILABLE = False
 
 st.set_page_config(page_title="Mahabank - Personal Loan Decision Tool", layout="wide")
 
 # ---------------------------
 # Helper financial functions
 # ---------------------------
+def _compound(r: float, months: int) -> float:
+    # float exponent: under numba an integer power compiles to repeated multiplication,
+    # which drifts from pow() in the last bits
+    return (1 + r) ** float(months)
+
 def emi_amount(principal: float, annual_rate_percent: float, months: int) -> float:
     if principal <= 0 or months <= 0:
         return 0.0
     r = annual_rate_percent / 100.0 / 12.0
     if r == 0:
         return principal / months
-    emi = principal * r * (1 + r) ** months / ((1 + r) ** months - 1)
+    c = _compound(r, months)
+    emi = principal * r * c / (c - 1)
     return emi
 
+def _emi_amount_np(principal, annual_rate_percent, months) -> np.ndarray:
+    principal = np.asarray(principal, dtype=float)
+    r, n = np.broadcast_arrays(np.asarray(annual_rate_percent, dtype=float) / 100.0 / 12.0, np.asarray(months, dtype=float))
+    # a batch only holds a few dozen distinct (rate, tenure) pairs, so raise each pair to its power once
+    pairs, inverse = np.unique(np.stack([r.ravel(), n.ravel()]), axis=1, return_inverse=True)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        c = ((1 + pairs[0]) ** pairs[1])[inverse.reshape(-1)].reshape(r.shape)
+        emi = np.where(r == 0, principal / n, principal * r * c / (c - 1))
+    return np.where((principal <= 0) | (n <= 0), 0.0, emi)
+
+if _NUMBA_AVAILABLE:
+    # same closed form compiled to native code; the ufunc spreads a whole column over all cores
+    _compound = njit(cache=True)(_compound)
+    emi_amount_vec = vectorize([float64(float64, float64, int64)], target='parallel', cache=True)(emi_amount)
+else:
+    # only ~25 rates x 2 tenures ever occur, so the interpreted path memoises the power
+    _compound = lru_cache(maxsize=None)(_compound)
+    emi_amount_vec = _emi_amount_np
+
+def _make_emi(months: int):
+    # tenure is only ever 60 or 84, so each variant is built with its exponent fixed
+    def emi(principal: float, annual_rate_percent: float) -> float:
+        if principal <= 0:
+            return 0.0
+        r = annual_rate_percent / 100.0 / 12.0
+        if r == 0:
+            return principal / months
+        c = _compound(r, months)
+        return principal * r * c / (c - 1)
+    return njit(cache=True)(emi) if _NUMBA_AVAILABLE else emi
+
+emi_60 = _make_emi(60)
+emi_84 = _make_emi(84)
+_EMI_BY_TENURE = {60: emi_60, 84: emi_84}
+
 # ---------------------------
 # Dataclasses
 # ---------------------------
@@ -76,27 +127,68 @@ class Decision:
 # ---------------------------
 # Scoring helpers (compact)
 # ---------------------------
+# Banded scores are lookup tables: PTS[i] applies where np.searchsorted(BINS, x, side) == i.
+# side='left' puts x == edge in the lower band (x<=edge), side='right' in the upper (x<edge).
+# Age, counts, years and CIBIL are whole numbers, so mixed bands are written on integer edges
+# (e.g. "d<2 / d<=3 / d<=5" becomes 2, 4, 6 with side='right').
+def _band(bins: np.ndarray, pts: np.ndarray, x, side: str = 'right'):
+    return pts[np.searchsorted(bins, x, side=side)]
+
 MARITAL_SCORE = {'single':3, 'married':5, 'divorced':1}
-AGE_SCORE = lambda age: 0 if age<=21 else (3 if age<=30 else (5 if age<=45 else (4 if age<=55 else 2)))
-DEPENDENT_SCORE = lambda d: 5 if d<2 else (4 if d<=3 else (3 if d<=5 else 1))
-BANK_REL_SCORE = lambda yrs: 1 if yrs==0 else (3 if yrs<5 else (4 if yrs<10 else 5))
+_AGE_BINS, _AGE_PTS = np.array([21, 30, 45, 55]), np.array([0, 3, 5, 4, 2], dtype=np.int8)
+_DEPENDENT_BINS, _DEPENDENT_PTS = np.array([2, 4, 6]), np.array([5, 4, 3, 1], dtype=np.int8)
+_BANK_REL_BINS, _BANK_REL_PTS = np.array([0, 1, 5, 10]), np.array([3, 1, 3, 4, 5], dtype=np.int8)
 RESIDENCE_SCORE = {'rented':1, 'owned_non_metro':2, 'owned_metro':3, 'kaccha':1}
-YEARS_AT_ADDRESS_SCORE = lambda y: 0 if y<1 else (1 if y<=3 else 2)
-SPOUSE_INCOME_SCORE = lambda amt: 5 if amt>500000 else (4 if amt>300000 else (2 if amt>100000 else 0))
-DISPOSABLE_INCOME_SCORE = lambda monthly: 0 if monthly<=8000 else (2 if monthly<=15000 else (3 if monthly<=25000 else 5))
-EMI_NMI_SCORE = lambda pct: 10 if 20<=pct<=25 else (8 if 25<pct<=40 else (6 if 40<pct<=65 else 0))
+_YEARS_AT_ADDRESS_BINS, _YEARS_AT_ADDRESS_PTS = np.array([1, 4]), np.array([0, 1, 2], dtype=np.int8)
+_SPOUSE_INCOME_BINS, _SPOUSE_INCOME_PTS = np.array([100000, 300000, 500000]), np.array([0, 2, 4, 5], dtype=np.int8)
+_DISPOSABLE_INCOME_BINS, _DISPOSABLE_INCOME_PTS = np.array([8000, 15000, 25000]), np.array([0, 2, 3, 5], dtype=np.int8)
+# 20% itself scores 10, anything below it scores 0
+_EMI_NMI_BINS, _EMI_NMI_PTS = np.array([np.nextafter(20, -np.inf), 25, 40, 65]), np.array([0, 10, 8, 6, 0], dtype=np.int8)
 REPAYMENT_TYPE_SCORE = {'others':0, 'post_dated_cheques':2, 'nach_other_bank':3, 'si_bom':4, 'checkoff':5}
-ITR_SCORE = lambda years: 5 if years>=3 else (4 if years==2 else (3 if years==1 else 0))
-AVG_BALANCE_SCORE = lambda ratio_percent: 5 if ratio_percent>200 else (4 if ratio_percent>100 else (3 if ratio_percent>50 else 2))
-CIBIL_SCORE_SCORE = lambda s: 10 if s>=800 else (8 if s>=750 else (6 if s>=700 else (0 if s>600 else 3)))
+_ITR_BINS, _ITR_PTS = np.array([1, 2, 3]), np.array([0, 3, 4, 5], dtype=np.int8)
+_AVG_BALANCE_BINS, _AVG_BALANCE_PTS = np.array([50, 100, 200]), np.array([2, 3, 4, 5], dtype=np.int8)
+_CIBIL_BINS, _CIBIL_PTS = np.array([601, 700, 750, 800]), np.array([3, 0, 6, 8, 10], dtype=np.int8)
 CREDIT_HISTORY_MAP = {'best_36m':10, 'no_overdues_12m_prior':6, 'less_6m_no_arrears':4, 'no_bureau_hit':3,
                       'overdues_12m':2, 'less6m_with_arrears':0, 'weak_with_settlements':0}
+_WORK_EXP_SAL_BINS, _WORK_EXP_SAL_PTS = np.array([1, 3, 5]), np.array([0, 3, 4, 5], dtype=np.int8)
 
 # Professional
-PROF_NETWORTH_SCORE = lambda ratio: 0 if ratio<0.5 else (3 if ratio<0.75 else 5)
+_PROF_NETWORTH_BINS, _PROF_NETWORTH_PTS = np.array([0.5, 0.75]), np.array([0, 3, 5], dtype=np.int8)
 PROF_INCOME_TREND_SCORE = {'increasing':5, 'stable':2, 'unstable':1, 'decreasing':0}
-PROF_TURNOVER_SCORE = lambda t: 1 if t<50e5 else (2 if t<80e5 else (3 if t<120e5 else (4 if t<400e5 else 5)))
-PROF_ITR_SCORE = lambda yrs: 5 if yrs>=5 else (4 if yrs>=3 else (3 if yrs>=2 else 0))
+_PROF_TURNOVER_BINS, _PROF_TURNOVER_PTS = np.array([50e5, 80e5, 120e5, 400e5]), np.array([1, 2, 3, 4, 5], dtype=np.int8)
+_PROF_ITR_BINS, _PROF_ITR_PTS = np.array([2, 3, 5]), np.array([0, 3, 4, 5], dtype=np.int8)
+_WORK_EXP_PROF_BINS, _WORK_EXP_PROF_PTS = np.array([2, 5, 7, 10]), np.array([0, 2, 3, 4, 5], dtype=np.int8)
+
+# Grade: above 80 -> 1, 71-80 -> 2, 61-70 -> 3, 50-60 -> 4, below 50 -> 5
+_GRADE_BINS, _GRADE_MAP = np.array([50, 61, 71, np.nextafter(80, np.inf)]), np.array([5, 4, 3, 2, 1])
+
+def AGE_SCORE_vec(age): return _band(_AGE_BINS, _AGE_PTS, age, 'left')
+def DEPENDENT_SCORE_vec(d): return _band(_DEPENDENT_BINS, _DEPENDENT_PTS, d)
+def BANK_REL_SCORE_vec(yrs): return _band(_BANK_REL_BINS, _BANK_REL_PTS, yrs)
+def YEARS_AT_ADDRESS_SCORE_vec(y): return _band(_YEARS_AT_ADDRESS_BINS, _YEARS_AT_ADDRESS_PTS, y)
+def SPOUSE_INCOME_SCORE_vec(amt): return _band(_SPOUSE_INCOME_BINS, _SPOUSE_INCOME_PTS, amt, 'left')
+def DISPOSABLE_INCOME_SCORE_vec(monthly): return _band(_DISPOSABLE_INCOME_BINS, _DISPOSABLE_INCOME_PTS, monthly, 'left')
+def EMI_NMI_SCORE_vec(pct): return _band(_EMI_NMI_BINS, _EMI_NMI_PTS, pct, 'left')
+def ITR_SCORE_vec(years): return _band(_ITR_BINS, _ITR_PTS, years)
+def AVG_BALANCE_SCORE_vec(ratio_percent): return _band(_AVG_BALANCE_BINS, _AVG_BALANCE_PTS, ratio_percent, 'left')
+def CIBIL_SCORE_SCORE_vec(s): return _band(_CIBIL_BINS, _CIBIL_PTS, s)
+def PROF_NETWORTH_SCORE_vec(ratio): return _band(_PROF_NETWORTH_BINS, _PROF_NETWORTH_PTS, ratio)
+def PROF_TURNOVER_SCORE_vec(t): return _band(_PROF_TURNOVER_BINS, _PROF_TURNOVER_PTS, t)
+def PROF_ITR_SCORE_vec(yrs): return _band(_PROF_ITR_BINS, _PROF_ITR_PTS, yrs)
+
+def AGE_SCORE(age): return AGE_SCORE_vec(age).item()
+def DEPENDENT_SCORE(d): return DEPENDENT_SCORE_vec(d).item()
+def BANK_REL_SCORE(yrs): return BANK_REL_SCORE_vec(yrs).item()
+def YEARS_AT_ADDRESS_SCORE(y): return YEARS_AT_ADDRESS_SCORE_vec(y).item()
+def SPOUSE_INCOME_SCORE(amt): return SPOUSE_INCOME_SCORE_vec(amt).item()
+def DISPOSABLE_INCOME_SCORE(monthly): return DISPOSABLE_INCOME_SCORE_vec(monthly).item()
+def EMI_NMI_SCORE(pct): return EMI_NMI_SCORE_vec(pct).item()
+def ITR_SCORE(years): return ITR_SCORE_vec(years).item()
+def AVG_BALANCE_SCORE(ratio_percent): return AVG_BALANCE_SCORE_vec(ratio_percent).item()
+def CIBIL_SCORE_SCORE(s): return CIBIL_SCORE_SCORE_vec(s).item()
+def PROF_NETWORTH_SCORE(ratio): return PROF_NETWORTH_SCORE_vec(ratio).item()
+def PROF_TURNOVER_SCORE(t): return PROF_TURNOVER_SCORE_vec(t).item()
+def PROF_ITR_SCORE(yrs): return PROF_ITR_SCORE_vec(yrs).item()
 
 # ---------------------------
 # Rate tables (extracted mapping)
@@ -109,114 +201,140 @@ RATE_TABLE_SALARIED = {
     ('C','other',800):1.90, ('C','other',776):2.45, ('C','other',750):2.95, ('C','other',700):3.45, ('C','other','ntc'):3.25
 }
 RATE_TABLE_PROF = {800:2.00, 776:2.50, 750:3.00, 700:3.50, 'ntc':2.75}
+# CIBIL -> rate slab key: below 700 is new-to-credit ('ntc'), otherwise the highest threshold reached
+_SLAB_BINS, _SLAB_VALUES = np.array([700, 750, 776, 800]), np.array(['ntc', 700, 750, 776, 800], dtype=object)
 
 # ---------------------------
 # Scoring functions
 # ---------------------------
-def compute_score_salaried(app: Applicant) -> Tuple[float,int]:
-    score = 0.0
-    # base academic default
-    score += 3
-    # employment type default (not in form) -> team can extend
-    score += 2
-    we = app.work_experience_years or 0
-    if we < 1:
-        we_pts = 0
-    elif we < 3:
-        we_pts = 3
-    elif we < 5:
-        we_pts = 4
-    else:
-        we_pts = 5
-    score += we_pts
-    score += MARITAL_SCORE.get((app.marital_status or 'single').lower(),3)
-    score += AGE_SCORE(app.age or 0)
-    score += DEPENDENT_SCORE(app.dependents or 0)
-    score += BANK_REL_SCORE(app.bank_relationship_years or 0)
-    score += RESIDENCE_SCORE.get((app.residence_type or 'rented'),1)
-    score += YEARS_AT_ADDRESS_SCORE(app.years_at_address or 0)
-    score += SPOUSE_INCOME_SCORE(app.spouse_income_annual or 0)
-    score += DISPOSABLE_INCOME_SCORE(app.disposable_monthly_income or 0)
-    score += EMI_NMI_SCORE(app.emi_nmi_ratio_percent or 0)
-    score += REPAYMENT_TYPE_SCORE.get((app.repayment_type or 'others'),0)
-    score += ITR_SCORE(app.itr_years_filed or 0)
-    score += AVG_BALANCE_SCORE(app.avg_balance_to_emi_ratio_percent or 0)
-    score += CIBIL_SCORE_SCORE(app.cibil_score or 0)
-    score += CREDIT_HISTORY_MAP.get((app.credit_history_score_choice or 'best_36m'),10)
-    score = min(score, 100)
-    grade = 1 if score>80 else (2 if score>=71 else (3 if score>=61 else (4 if score>=50 else 5)))
+# The numeric cores take plain floats only (categorical fields arrive already mapped to
+# their points), so they compile under numba; compute_score_* adapt an Applicant to them.
+def _score_sal(age, we, marital_pts, deps, bank_yrs, res_pts, yrs_addr, spouse_inc, disp, emi_pct, rep_pts, itr, avg_bal, cibil, hist_pts):
+    # base academic default + employment type default (not in form) -> team can extend
+    score = 3.0 + 2.0
+    score += _WORK_EXP_SAL_PTS[np.searchsorted(_WORK_EXP_SAL_BINS, we, side='right')]
+    score += marital_pts
+    score += _AGE_PTS[np.searchsorted(_AGE_BINS, age, side='left')]
+    score += _DEPENDENT_PTS[np.searchsorted(_DEPENDENT_BINS, deps, side='right')]
+    score += _BANK_REL_PTS[np.searchsorted(_BANK_REL_BINS, bank_yrs, side='right')]
+    score += res_pts
+    score += _YEARS_AT_ADDRESS_PTS[np.searchsorted(_YEARS_AT_ADDRESS_BINS, yrs_addr, side='right')]
+    score += _SPOUSE_INCOME_PTS[np.searchsorted(_SPOUSE_INCOME_BINS, spouse_inc, side='left')]
+    score += _DISPOSABLE_INCOME_PTS[np.searchsorted(_DISPOSABLE_INCOME_BINS, disp, side='left')]
+    score += _EMI_NMI_PTS[np.searchsorted(_EMI_NMI_BINS, emi_pct, side='left')]
+    score += rep_pts
+    score += _ITR_PTS[np.searchsorted(_ITR_BINS, itr, side='right')]
+    score += _AVG_BALANCE_PTS[np.searchsorted(_AVG_BALANCE_BINS, avg_bal, side='left')]
+    score += _CIBIL_PTS[np.searchsorted(_CIBIL_BINS, cibil, side='right')]
+    score += hist_pts
+    score = min(score, 100.0)
+    grade = int(_GRADE_MAP[np.searchsorted(_GRADE_BINS, score, side='right')])
+    return score, grade
+
+def _score_prof(age, we, marital_pts, deps, bank_yrs, res_pts, yrs_addr, disp, emi_pct, networth_ratio, trend_pts, turnover, itr, avg_bal, cibil, hist_pts):
+    score = 3.0
+    score += _DEPENDENT_PTS[np.searchsorted(_DEPENDENT_BINS, deps, side='right')]
+    score += _WORK_EXP_PROF_PTS[np.searchsorted(_WORK_EXP_PROF_BINS, we, side='right')]
+    score += marital_pts
+    score += _AGE_PTS[np.searchsorted(_AGE_BINS, age, side='left')]
+    score += _BANK_REL_PTS[np.searchsorted(_BANK_REL_BINS, bank_yrs, side='right')] * (10/5)
+    score += res_pts
+    score += _YEARS_AT_ADDRESS_PTS[np.searchsorted(_YEARS_AT_ADDRESS_BINS, yrs_addr, side='right')]
+    score += _DISPOSABLE_INCOME_PTS[np.searchsorted(_DISPOSABLE_INCOME_BINS, disp, side='left')]
+    score += _EMI_NMI_PTS[np.searchsorted(_EMI_NMI_BINS, emi_pct, side='left')]
+    score += _PROF_NETWORTH_PTS[np.searchsorted(_PROF_NETWORTH_BINS, networth_ratio, side='right')]
+    score += trend_pts
+    score += _PROF_TURNOVER_PTS[np.searchsorted(_PROF_TURNOVER_BINS, turnover, side='right')]
+    score += _PROF_ITR_PTS[np.searchsorted(_PROF_ITR_BINS, itr, side='right')]
+    score += _AVG_BALANCE_PTS[np.searchsorted(_AVG_BALANCE_BINS, avg_bal, side='left')]
+    score += _CIBIL_PTS[np.searchsorted(_CIBIL_BINS, cibil, side='right')]
+    score += hist_pts
+    score = min(score, 100.0)
+    grade = int(_GRADE_MAP[np.searchsorted(_GRADE_BINS, score, side='right')])
     return score, grade
 
+if _NUMBA_AVAILABLE:
+    _score_sal = njit(cache=True)(_score_sal)
+    _score_prof = njit(cache=True)(_score_prof)
+    # compile (or load from the on-disk cache) at startup rather than on the first evaluation
+    _score_sal(*(0.0,) * 15)
+    _score_prof(*(0.0,) * 16)
+
+    # Bulk drivers: rows are independent, so prange splits them across cores without the GIL.
+    @njit(parallel=True, cache=True)
+    def _score_all_sal(age, we, marital_pts, deps, bank_yrs, res_pts, yrs_addr, spouse_inc, disp, emi_pct, rep_pts, itr, avg_bal, cibil, hist_pts):
+        out = np.empty(age.shape[0], dtype=np.float64)
+        for i in prange(age.shape[0]):
+            out[i] = _score_sal(age[i], we[i], marital_pts[i], deps[i], bank_yrs[i], res_pts[i], yrs_addr[i], spouse_inc[i],
+                                disp[i], emi_pct[i], rep_pts[i], itr[i], avg_bal[i], cibil[i], hist_pts[i])[0]
+        return out
+
+    @njit(parallel=True, cache=True)
+    def _score_all_prof(age, we, marital_pts, deps, bank_yrs, res_pts, yrs_addr, disp, emi_pct, networth_ratio, trend_pts, turnover, itr, avg_bal, cibil, hist_pts):
+        out = np.empty(age.shape[0], dtype=np.float64)
+        for i in prange(age.shape[0]):
+            out[i] = _score_prof(age[i], we[i], marital_pts[i], deps[i], bank_yrs[i], res_pts[i], yrs_addr[i], disp[i], emi_pct[i],
+                                 networth_ratio[i], trend_pts[i], turnover[i], itr[i], avg_bal[i], cibil[i], hist_pts[i])[0]
+        return out
+
+    _score_all_sal(*(np.zeros(0),) * 15)
+    _score_all_prof(*(np.zeros(0),) * 16)
+
+def compute_score_salaried(app: Applicant) -> Tuple[float,int]:
+    return _score_sal(
+        float(app.age or 0),
+        float(app.work_experience_years or 0),
+        float(MARITAL_SCORE.get((app.marital_status or 'single').lower(),3)),
+        float(app.dependents or 0),
+        float(app.bank_relationship_years or 0),
+        float(RESIDENCE_SCORE.get((app.residence_type or 'rented'),1)),
+        float(app.years_at_address or 0),
+        float(app.spouse_income_annual or 0),
+        float(app.disposable_monthly_income or 0),
+        float(app.emi_nmi_ratio_percent or 0),
+        float(REPAYMENT_TYPE_SCORE.get((app.repayment_type or 'others'),0)),
+        float(app.itr_years_filed or 0),
+        float(app.avg_balance_to_emi_ratio_percent or 0),
+        float(app.cibil_score or 0),
+        float(CREDIT_HISTORY_MAP.get((app.credit_history_score_choice or 'best_36m'),10)),
+    )
+
 def compute_score_professional(app: Applicant) -> Tuple[float,int]:
-    score = 0.0
-    score += 3
-    score += DEPENDENT_SCORE(app.dependents or 0)
-    we = app.work_experience_years or 0
-    if we < 2:
-        we_pts = 0
-    elif we < 5:
-        we_pts = 2
-    elif we < 7:
-        we_pts = 3
-    elif we < 10:
-        we_pts = 4
-    else:
-        we_pts = 5
-    score += we_pts
-    score += MARITAL_SCORE.get((app.marital_status or 'single').lower(),3)
-    score += AGE_SCORE(app.age or 0)
-    score += BANK_REL_SCORE(app.bank_relationship_years or 0) * (10/5)
-    score += RESIDENCE_SCORE.get((app.residence_type or 'rented'),1)
-    score += YEARS_AT_ADDRESS_SCORE(app.years_at_address or 0)
-    score += DISPOSABLE_INCOME_SCORE(app.disposable_monthly_income or 0)
-    score += EMI_NMI_SCORE(app.emi_nmi_ratio_percent or 0)
     if app.proposed_loan_amount and app.net_worth is not None and app.proposed_loan_amount>0:
         ratio = app.net_worth / app.proposed_loan_amount
     else:
         ratio = 0.0
-    score += PROF_NETWORTH_SCORE(ratio)
-    score += PROF_INCOME_TREND_SCORE.get((app.income_trend or 'stable'),2)
-    score += PROF_TURNOVER_SCORE(app.business_turnover_annual or 0)
-    score += PROF_ITR_SCORE(app.itr_years_filed or 0)
-    score += AVG_BALANCE_SCORE(app.avg_balance_to_emi_ratio_percent or 0)
-    score += CIBIL_SCORE_SCORE(app.cibil_score or 0)
-    score += CREDIT_HISTORY_MAP.get((app.credit_history_score_choice or 'best_36m'),10)
-    score = min(score, 100)
-    grade = 1 if score>80 else (2 if score>=71 else (3 if score>=61 else (4 if score>=50 else 5)))
-    return score, grade
+    return _score_prof(
+        float(app.age or 0),
+        float(app.work_experience_years or 0),
+        float(MARITAL_SCORE.get((app.marital_status or 'single').lower(),3)),
+        float(app.dependents or 0),
+        float(app.bank_relationship_years or 0),
+        float(RESIDENCE_SCORE.get((app.residence_type or 'rented'),1)),
+        float(app.years_at_address or 0),
+        float(app.disposable_monthly_income or 0),
+        float(app.emi_nmi_ratio_percent or 0),
+        float(ratio),
+        float(PROF_INCOME_TREND_SCORE.get((app.income_trend or 'stable'),2)),
+        float(app.business_turnover_annual or 0),
+        float(app.itr_years_filed or 0),
+        float(app.avg_balance_to_emi_ratio_percent or 0),
+        float(app.cibil_score or 0),
+        float(CREDIT_HISTORY_MAP.get((app.credit_history_score_choice or 'best_36m'),10)),
+    )
 
 # ---------------------------
 # Rate selection
 # ---------------------------
 def determine_interest_rate(app: Applicant, base_rllr_percent: float) -> float:
     if app.applicant_type == 'salaried':
-        s = app.cibil_score or 0
-        if s>=800:
-            slab = 800
-        elif s>=776:
-            slab = 776
-        elif s>=750:
-            slab = 750
-        elif s>=700:
-            slab = 700
-        else:
-            slab = 'ntc'
+        slab = _SLAB_VALUES[np.searchsorted(_SLAB_BINS, app.cibil_score or 0, side='right')]
         key = (app.category or 'C', 'bom' if app.salary_account_with_bom else 'other', slab)
         spread = RATE_TABLE_SALARIED.get(key)
         if spread is None:
             spread = 3.5
     else:
-        s = app.cibil_score or 0
-        if s>=800:
-            slab = 800
-        elif s>=776:
-            slab = 776
-        elif s>=750:
-            slab = 750
-        elif s>=700:
-            slab = 700
-        else:
-            slab = 'ntc'
+        slab = _SLAB_VALUES[np.searchsorted(_SLAB_BINS, app.cibil_score or 0, side='right')]
         spread = RATE_TABLE_PROF.get(slab, RATE_TABLE_PROF.get('ntc', 2.75))
     return base_rllr_percent + spread
 
@@ -256,19 +374,19 @@ def eligibility_and_recommendation(app: Applicant, base_rllr_percent: float) ->
         ded_limit_pct = 60
     proposed = app.proposed_loan_amount or eligible_amount
     annual_rate = determine_interest_rate(app, base_rllr_percent)
-    emi = emi_amount(proposed, annual_rate, tenure_months)
     gross_monthly = app.gross_monthly_income or (app.gross_annual_income/12 if app.gross_annual_income else 0)
     if gross_monthly <= 0:
         return Decision(False, "Insufficient income data to compute eligibility", details={'score':score,'grade':grade})
+    emi = _EMI_BY_TENURE[tenure_months](proposed, annual_rate)
     proposed_emi_pct = (emi / gross_monthly) * 100
     if proposed_emi_pct > ded_limit_pct:
         return Decision(False, f"Proposed EMI {emi:.2f} (={proposed_emi_pct:.2f}% of gross monthly) exceeds allowed deduction norm of {ded_limit_pct}%.", details={'score':score,'grade':grade,'proposed_emi_pct':proposed_emi_pct})
-    if proposed > eligible_amount:
-        recommended = eligible_amount
-        rec_emi = emi_amount(recommended, annual_rate, tenure_months)
-    else:
-        recommended = proposed
+    recommended = min(proposed, eligible_amount)
+    if recommended == proposed:
         rec_emi = emi
+    else:
+        # EMI is linear in the principal: scale the proposed EMI instead of recomputing (1+r)**n
+        rec_emi = emi * recommended / proposed if recommended > 0 else 0.0
     decision_flag = True if grade <= 3 else False
     reason = "Clear sanction" if grade==1 else ("Sanction with normal authority" if grade in (2,3) else "Requires higher authority/decline")
     return Decision(decision_flag, reason, recommended_loan=recommended, tenure_months=tenure_months, annual_rate_percent=annual_rate, emi=rec_emi, score=score, grade=grade, details={
@@ -277,6 +395,238 @@ def eligibility_and_recommendation(app: Applicant, base_rllr_percent: float) ->
         'proposed_emi_pct': proposed_emi_pct
     })
 
+# ---------------------------
+# Vectorized bulk scoring (same rules as above, one column at a time)
+# ---------------------------
+# Frames reaching the scorers have already been through _coerce_bulk_frame, so numeric
+# columns are float64 with NaN only where the single-applicant path would see None.
+_BULK_COLUMN_DEFAULTS = {
+    'applicant_type': 'salaried', 'age': 30, 'salary_account_with_bom': False, 'category': 'C', 'work_experience_years': 0,
+    'dependents': 0, 'bank_relationship_years': 0, 'years_at_address': 0, 'spouse_income_annual': 0.0,
+    'disposable_monthly_income': 0.0, 'emi_nmi_ratio_percent': 0.0, 'repayment_type': 'others',
+    'itr_years_filed': 0, 'avg_balance_to_emi_ratio_percent': 0.0, 'credit_history_score_choice': 'best_36m',
+}
+_BULK_INT_COLS = ['age', 'cibil_score', 'dependents', 'bank_relationship_years', 'years_at_address', 'itr_years_filed']
+_BULK_FLOAT_COLS = ['gross_monthly_income', 'gross_annual_income', 'work_experience_years', 'spouse_income_annual',
+                    'disposable_monthly_income', 'emi_nmi_ratio_percent', 'avg_balance_to_emi_ratio_percent',
+                    'net_worth', 'proposed_loan_amount', 'business_turnover_annual']
+# blank values here cannot be scored, so those rows are dropped (cibil_score may be blank)
+_BULK_REQUIRED_COLS = ['age', 'dependents', 'bank_relationship_years', 'years_at_address', 'itr_years_filed']
+
+def _coerce_bulk_frame(df: pd.DataFrame) -> pd.DataFrame:
+    frame = df.assign(**{c: v for c, v in _BULK_COLUMN_DEFAULTS.items() if c not in df.columns})
+    frame = frame.reindex(columns=list(Applicant.__dataclass_fields__))
+    if 'name' not in df.columns:
+        frame['name'] = 'row' + frame.index.astype(str)
+    numeric_cols = _BULK_INT_COLS + _BULK_FLOAT_COLS
+    numeric = frame[numeric_cols].apply(pd.to_numeric, errors='coerce')
+    unparsable = (numeric.isna() & frame[numeric_cols].notna()).any(axis=1) | numeric[_BULK_REQUIRED_COLS].isna().any(axis=1)
+    frame[numeric_cols] = np.trunc(numeric[_BULK_INT_COLS]).join(numeric[_BULK_FLOAT_COLS]).astype(float)
+    # a blank work_experience_years stays NaN, as on the single path (it bands into the top bucket),
+    # and so does a blank category, which matches no rate table key and prices at the 3.5 spread
+    frame = frame.fillna({'spouse_income_annual': 0.0, 'disposable_monthly_income': 0.0,
+                          'emi_nmi_ratio_percent': 0.0, 'avg_balance_to_emi_ratio_percent': 0.0,
+                          'marital_status': 'single',
+                          'residence_type': 'rented', 'repayment_type': 'others', 'income_trend': 'stable',
+                          'credit_history_score_choice': 'best_36m'})
+    # bool() per cell as the row parser always did: a missing column defaults to False above, but a
+    # blank cell is NaN and counts as True (the compliance app's _flag follows the same rule)
+    frame['salary_account_with_bom'] = frame['salary_account_with_bom'].map(bool)
+    # categoricals are cleaned once here so the scorers only have to map them to points
+    frame['marital_status'] = frame['marital_status'].astype(str).str.lower()
+    return frame[~unparsable]
+
+def _num(df: pd.DataFrame, col: str, default: float = 0.0) -> np.ndarray:
+    return df[col].fillna(default).to_numpy(dtype=float)
+
+def grade_vec(scores) -> np.ndarray:
+    s = np.asarray(scores, dtype=float)
+    return _GRADE_MAP[np.digitize(s, _GRADE_BINS)]
+
+def score_salaried_vec(df: pd.DataFrame) -> pd.Series:
+    we = df['work_experience_years'].to_numpy(dtype=float)
+    age = _num(df, 'age')
+    deps = _num(df, 'dependents')
+    bank = _num(df, 'bank_relationship_years')
+    yrs_addr = _num(df, 'years_at_address')
+    spouse = _num(df, 'spouse_income_annual')
+    disp = _num(df, 'disposable_monthly_income')
+    emi_pct = _num(df, 'emi_nmi_ratio_percent')
+    itr = _num(df, 'itr_years_filed')
+    avg_bal = _num(df, 'avg_balance_to_emi_ratio_percent')
+    cibil = _num(df, 'cibil_score')
+    marital = df['marital_status'].map(MARITAL_SCORE).fillna(3).to_numpy(dtype=float)
+    residence = df['residence_type'].map(RESIDENCE_SCORE).fillna(1).to_numpy(dtype=float)
+    repayment = df['repayment_type'].map(REPAYMENT_TYPE_SCORE).fillna(0).to_numpy(dtype=float)
+    history = df['credit_history_score_choice'].map(CREDIT_HISTORY_MAP).fillna(10).to_numpy(dtype=float)
+    if _NUMBA_AVAILABLE:
+        return pd.Series(_score_all_sal(age, we, marital, deps, bank, residence, yrs_addr, spouse, disp, emi_pct,
+                                        repayment, itr, avg_bal, cibil, history), index=df.index)
+    pts = np.column_stack([
+        _band(_WORK_EXP_SAL_BINS, _WORK_EXP_SAL_PTS, we),
+        marital.astype(np.int8),
+        AGE_SCORE_vec(age),
+        DEPENDENT_SCORE_vec(deps),
+        BANK_REL_SCORE_vec(bank),
+        residence.astype(np.int8),
+        YEARS_AT_ADDRESS_SCORE_vec(yrs_addr),
+        SPOUSE_INCOME_SCORE_vec(spouse),
+        DISPOSABLE_INCOME_SCORE_vec(disp),
+        EMI_NMI_SCORE_vec(emi_pct),
+        repayment.astype(np.int8),
+        ITR_SCORE_vec(itr),
+        AVG_BALANCE_SCORE_vec(avg_bal),
+        CIBIL_SCORE_SCORE_vec(cibil),
+        history.astype(np.int8),
+    ])
+    # one row-wise reduction over the (N, criteria) matrix; base academic + employment defaults = 3 + 2
+    return pd.Series(np.minimum(3 + 2 + pts.sum(axis=1, dtype=np.int16), 100), index=df.index, dtype=float)
+
+def score_professional_vec(df: pd.DataFrame) -> pd.Series:
+    we = df['work_experience_years'].to_numpy(dtype=float)
+    age = _num(df, 'age')
+    deps = _num(df, 'dependents')
+    bank = _num(df, 'bank_relationship_years')
+    yrs_addr = _num(df, 'years_at_address')
+    disp = _num(df, 'disposable_monthly_income')
+    emi_pct = _num(df, 'emi_nmi_ratio_percent')
+    itr = _num(df, 'itr_years_filed')
+    avg_bal = _num(df, 'avg_balance_to_emi_ratio_percent')
+    cibil = _num(df, 'cibil_score')
+    turnover = _num(df, 'business_turnover_annual')
+    proposed = _num(df, 'proposed_loan_amount')
+    net_worth = df['net_worth'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where((proposed > 0) & ~np.isnan(net_worth), net_worth / proposed, 0.0)
+    marital = df['marital_status'].map(MARITAL_SCORE).fillna(3).to_numpy(dtype=float)
+    residence = df['residence_type'].map(RESIDENCE_SCORE).fillna(1).to_numpy(dtype=float)
+    trend = df['income_trend'].map(PROF_INCOME_TREND_SCORE).fillna(2).to_numpy(dtype=float)
+    history = df['credit_history_score_choice'].map(CREDIT_HISTORY_MAP).fillna(10).to_numpy(dtype=float)
+    if _NUMBA_AVAILABLE:
+        return pd.Series(_score_all_prof(age, we, marital, deps, bank, residence, yrs_addr, disp, emi_pct, ratio,
+                                         trend, turnover, itr, avg_bal, cibil, history), index=df.index)
+    pts = np.column_stack([
+        DEPENDENT_SCORE_vec(deps),
+        _band(_WORK_EXP_PROF_BINS, _WORK_EXP_PROF_PTS, we),
+        marital.astype(np.int8),
+        AGE_SCORE_vec(age),
+        BANK_REL_SCORE_vec(bank) * 2,
+        residence.astype(np.int8),
+        YEARS_AT_ADDRESS_SCORE_vec(yrs_addr),
+        DISPOSABLE_INCOME_SCORE_vec(disp),
+        EMI_NMI_SCORE_vec(emi_pct),
+        PROF_NETWORTH_SCORE_vec(ratio),
+        trend.astype(np.int8),
+        PROF_TURNOVER_SCORE_vec(turnover),
+        PROF_ITR_SCORE_vec(itr),
+        AVG_BALANCE_SCORE_vec(avg_bal),
+        CIBIL_SCORE_SCORE_vec(cibil),
+        history.astype(np.int8),
+    ])
+    return pd.Series(np.minimum(3 + pts.sum(axis=1, dtype=np.int16), 100), index=df.index, dtype=float)
+
+@st.cache_resource
+def _rate_frames() -> Tuple[pd.DataFrame, pd.DataFrame]:
+    # built once per server process instead of on every rerun; only ever read (merged against)
+    sal = pd.DataFrame([(cat, channel, slab, spread) for (cat, channel, slab), spread in RATE_TABLE_SALARIED.items()],
+                       columns=['category', 'channel', 'slab', 'spread'])
+    prof = pd.DataFrame(list(RATE_TABLE_PROF.items()), columns=['slab', 'spread'])
+    return sal, prof
+
+RATE_DF_SAL, RATE_DF_PROF = _rate_frames()
+
+def _cibil_slab_vec(cibil: np.ndarray) -> np.ndarray:
+    return _SLAB_VALUES[np.searchsorted(_SLAB_BINS, cibil, side='right')]
+
+def interest_rate_vec(df: pd.DataFrame, base_rllr_percent: float, salaried: bool) -> np.ndarray:
+    keys = pd.DataFrame({'slab': _cibil_slab_vec(_num(df, 'cibil_score'))})
+    if salaried:
+        keys['category'] = df['category'].astype(str).to_numpy()
+        keys['channel'] = np.where(df['salary_account_with_bom'], 'bom', 'other')
+        spread = keys.merge(RATE_DF_SAL, on=['category', 'channel', 'slab'], how='left')['spread'].fillna(3.5)
+    else:
+        spread = keys.merge(RATE_DF_PROF, on='slab', how='left')['spread'].fillna(RATE_TABLE_PROF.get('ntc', 2.75))
+    return base_rllr_percent + spread.to_numpy(dtype=float)
+
+def _decide_vec(df: pd.DataFrame, base_rllr_percent: float, salaried: bool) -> pd.DataFrame:
+    score = (score_salaried_vec(df) if salaried else score_professional_vec(df)).to_numpy(dtype=float)
+    grade = grade_vec(score)
+    cibil = df['cibil_score'].to_numpy(dtype=float)
+    age = _num(df, 'age')
+    gm = _num(df, 'gross_monthly_income')
+    ga = _num(df, 'gross_annual_income')
+    if salaried:
+        cat_a = (df['category'] == 'A').to_numpy()
+        eligible_amount = np.minimum(20 * gm, 20_00_000)
+        tenure_months = np.where(cat_a & df['salary_account_with_bom'].to_numpy(), 84, 60)
+        ded_limit_pct = np.where(cat_a, 65, 60)
+    else:
+        eligible_amount = np.minimum(1.5 * ga, 20_00_000)
+        tenure_months = np.full(len(df), 60)
+        ded_limit_pct = np.full(len(df), 60)
+    proposed = _num(df, 'proposed_loan_amount')
+    proposed = np.where(proposed != 0, proposed, eligible_amount)
+    annual_rate = interest_rate_vec(df, base_rllr_percent, salaried)
+    emi = emi_amount_vec(proposed, annual_rate, tenure_months)
+    gross_monthly = np.where(gm != 0, gm, ga / 12)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        proposed_emi_pct = (emi / gross_monthly) * 100
+    recommended = np.minimum(proposed, eligible_amount)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rec_emi = np.where(recommended == proposed, emi, np.where(recommended > 0, emi * recommended / proposed, 0.0))
+
+    # rejection masks, in the same order as eligibility_and_recommendation checks them
+    low_cibil = cibil < 700
+    bad_age = ~low_cibil & salaried & ((age < 21) | (age > 58))
+    no_income = ~(low_cibil | bad_age) & (gross_monthly <= 0)
+    over_limit = ~(low_cibil | bad_age | no_income) & (proposed_emi_pct > ded_limit_pct)
+    rejected = low_cibil | bad_age
+    sanctioned = ~(rejected | no_income | over_limit)
+
+    reason = np.where(grade == 1, "Clear sanction", np.where(grade <= 3, "Sanction with normal authority", "Requires higher authority/decline")).astype(object)
+    reason[low_cibil] = [f"CIBIL score below minimum cut-off 700 (CIBIL={int(s)})" for s in cibil[low_cibil]]
+    reason[bad_age] = [f"Age not within permissible range for salaried (21-58). Age={int(a)}" for a in age[bad_age]]
+    reason[no_income] = "Insufficient income data to compute eligibility"
+    reason[over_limit] = [f"Proposed EMI {e:.2f} (={p:.2f}% of gross monthly) exceeds allowed deduction norm of {d}%."
+                          for e, p, d in zip(emi[over_limit], proposed_emi_pct[over_limit], ded_limit_pct[over_limit])]
+    return pd.DataFrame({
+        'name': df['name'],
+        'applicant_type': df['applicant_type'],
+        'score': np.where(rejected, np.nan, score),
+        'grade': np.where(rejected, np.nan, grade),
+        'eligible': sanctioned & (grade <= 3),
+        'reason': reason,
+        'recommended_loan': np.where(sanctioned, recommended, 0.0),
+        'tenure_months': np.where(sanctioned, tenure_months, 0),
+        'annual_rate_percent': np.where(sanctioned, annual_rate, 0.0),
+        'emi': np.where(sanctioned, rec_emi, 0.0),
+        'proposed': np.where(sanctioned, proposed, np.nan),
+        'eligible_by_income': np.where(sanctioned, eligible_amount, np.nan),
+        'proposed_emi_pct': np.where(sanctioned | over_limit, proposed_emi_pct, np.nan),
+    }, index=df.index)
+
+def bulk_evaluate(df: pd.DataFrame, base_rllr_percent: float) -> pd.DataFrame:
+    """Score a raw uploaded frame column-wise; rows that cannot be parsed are left out."""
+    df = _coerce_bulk_frame(df)
+    salaried = df['applicant_type'] == 'salaried'
+    professional = df['applicant_type'] == 'professional'
+    other = df[~(salaried | professional)]
+    invalid = pd.DataFrame({
+        'name': other['name'],
+        'applicant_type': other['applicant_type'],
+        'eligible': False,
+        'reason': "Applicant type must be 'salaried' or 'professional'",
+        'recommended_loan': 0.0,
+        'tenure_months': 0,
+        'annual_rate_percent': 0.0,
+        'emi': 0.0,
+    }, index=other.index)
+    parts = [_decide_vec(df[salaried], base_rllr_percent, True),
+             _decide_vec(df[professional], base_rllr_percent, False),
+             invalid]
+    parts = [p for p in parts if len(p)] or parts[:1]
+    return pd.concat(parts)[list(parts[0].columns)].sort_index()
+
 # ---------------------------
 # UI / App layout
 # ---------------------------
@@ -382,6 +732,11 @@ def single_app_form():
 # ---------------------------
 # Bulk CSV processing
 # ---------------------------
+@st.cache_data
+def _read_upload(data: bytes) -> pd.DataFrame:
+    # keyed on the file contents, so changing the RLLR re-evaluates without re-parsing
+    return pd.read_csv(BytesIO(data))
+
 def bulk_csv_processor():
     st.subheader("Bulk Upload (CSV)")
     st.markdown("CSV must contain columns matching these field names (case-sensitive):\n"
@@ -398,66 +753,15 @@ def bulk_csv_processor():
         }])
         st.download_button("Download sample CSV", sample.to_csv(index=False), file_name="sample_applicants.csv", mime="text/csv")
     if uploaded is not None:
-        df = pd.read_csv(uploaded)
+        df = _read_upload(uploaded.getvalue())
         st.write(f"Uploaded {len(df)} rows")
-        # Process each row
-        results = []
-        for idx, row in df.iterrows():
-            # safe conversions / defaults
-            try:
-                applicant = Applicant(
-                    name = row.get('name', f'row{idx}'),
-                    applicant_type = row.get('applicant_type','salaried'),
-                    age = int(row.get('age', 30)),
-                    gross_monthly_income = float(row['gross_monthly_income']) if not pd.isna(row.get('gross_monthly_income')) else None,
-                    gross_annual_income = float(row['gross_annual_income']) if not pd.isna(row.get('gross_annual_income')) else None,
-                    cibil_score = int(row['cibil_score']) if not pd.isna(row.get('cibil_score')) else None,
-                    salary_account_with_bom = bool(row.get('salary_account_with_bom', False)),
-                    category = row.get('category'),
-                    work_experience_years = float(row.get('work_experience_years',0)),
-                    marital_status = row.get('marital_status'),
-                    dependents = int(row.get('dependents',0)),
-                    bank_relationship_years = int(row.get('bank_relationship_years',0)),
-                    residence_type = row.get('residence_type'),
-                    years_at_address = int(row.get('years_at_address',0)),
-                    spouse_income_annual = float(row.get('spouse_income_annual',0)) if not pd.isna(row.get('spouse_income_annual')) else 0.0,
-                    disposable_monthly_income = float(row.get('disposable_monthly_income',0)) if not pd.isna(row.get('disposable_monthly_income')) else 0.0,
-                    emi_nmi_ratio_percent = float(row.get('emi_nmi_ratio_percent',0)) if not pd.isna(row.get('emi_nmi_ratio_percent')) else 0.0,
-                    repayment_type = row.get('repayment_type','others'),
-                    itr_years_filed = int(row.get('itr_years_filed',0)),
-                    avg_balance_to_emi_ratio_percent = float(row.get('avg_balance_to_emi_ratio_percent',0)) if not pd.isna(row.get('avg_balance_to_emi_ratio_percent')) else 0.0,
-                    credit_history_score_choice = row.get('credit_history_score_choice','best_36m'),
-                    net_worth = float(row.get('net_worth')) if not pd.isna(row.get('net_worth')) else None,
-                    proposed_loan_amount = float(row.get('proposed_loan_amount')) if not pd.isna(row.get('proposed_loan_amount')) else None,
-                    business_turnover_annual = float(row.get('business_turnover_annual')) if not pd.isna(row.get('business_turnover_annual')) else None,
-                    income_trend = row.get('income_trend')
-                )
-            except Exception as e:
-                st.warning(f"Skipping row {idx} due to parsing error: {e}")
-                continue
-            dec = eligibility_and_recommendation(applicant, base_rllr)
-            r = {
-                'name': applicant.name,
-                'applicant_type': applicant.applicant_type,
-                'score': dec.score,
-                'grade': dec.grade,
-                'eligible': dec.eligible,
-                'reason': dec.reason,
-                'recommended_loan': dec.recommended_loan,
-                'tenure_months': dec.tenure_months,
-                'annual_rate_percent': dec.annual_rate_percent,
-                'emi': dec.emi
-            }
-            # merge details if present
-            if dec.details:
-                for k,v in dec.details.items():
-                    r[k] = v
-            results.append(r)
-        results_df = pd.DataFrame(results)
+        results_df = bulk_evaluate(df, base_rllr)
+        for idx in df.index.difference(results_df.index):
+            st.warning(f"Skipping row {idx} due to parsing error: missing or non-numeric value in a numeric column")
         st.dataframe(results_df)
         csv_result = results_df.to_csv(index=False)
         st.download_button("Download results CSV", csv_result, file_name="personal_loan_decisions.csv", mime="text/csv")
-        st.download_button("Download results JSON", results_df.to_json(orient='records'), file_name="personal_loan_decisions.json", mime="application/json")
+        st.download_button("Download results JSON", json.dumps(results_df.astype(object).where(results_df.notna(), None).to_dict('records')), file_name="personal_loan_decisions.json", mime="application/json")
 
 # ---------------------------
 # Decision UI rendering
@@ -500,7 +804,7 @@ def show_decision_ui(applicant: Applicant, decision: Decision):
         'annual_rate_percent': decision.annual_rate_percent,
         'emi': decision.emi
     }
-    st.download_button("Download sanction summary (JSON)", pd.Series(summary).to_json(), file_name=f"sanction_{applicant.name.replace(' ','_')}.json", mime="application/json")
+    st.download_button("Download sanction summary (JSON)", json.dumps(summary, default=str), file_name=f"sanction_{applicant.name.replace(' ','_')}.json", mime="application/json")
 
 # ---------------------------
 # Main mode switch
@@ -15,14 +15,31 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import math
 import json
+import csv
 from dataclasses import dataclass, asdict
 from typing import Optional, Dict, Tuple
-from io import BytesIO
+from functools import lru_cache
+from bisect import bisect_left, bisect_right
+from io import StringIO
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from datetime import date
+from types import MappingProxyType
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; scoring falls back to the bisect / NumPy paths
+    _NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:  # orjson is optional; annexures fall back to the stdlib json encoder
+    _ORJSON_AVAILABLE = False
 
 st.set_page_config(page_title="Mahabank - Personal Loan Decision Tool", layout="wide")
 
@@ -35,6 +52,25 @@ def emi_amount(principal: float, annual_rate_percent: float, months: int) -> flo
     emi = principal * r * (1 + r) ** months / ((1 + r) ** months - 1)
     return emi
 
+def emi_vec(principal: np.ndarray, annual_rate_percent: np.ndarray, months: np.ndarray) -> np.ndarray:
+    # emi_amount over whole columns, including its zero-principal / zero-rate guards
+    principal = np.asarray(principal, dtype=float)
+    r = np.asarray(annual_rate_percent, dtype=float) / 100.0 / 12.0
+    n = np.asarray(months, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        c = (1 + r) ** n
+        emi = np.where(r == 0, principal / n, principal * r * c / (c - 1))
+    return np.where((principal <= 0) | (n <= 0), 0.0, emi)
+
+# scoring-only Applicant fields -> value a blank (None / 0 / '') is read as
+_APPLICANT_BLANK_DEFAULTS = (
+    ('work_experience_years', 0), ('marital_status', 'single'), ('dependents', 0), ('bank_relationship_years', 0),
+    ('residence_type', 'rented'), ('years_at_address', 0), ('spouse_income_annual', 0), ('disposable_monthly_income', 0),
+    ('emi_nmi_ratio_percent', 0), ('repayment_type', 'others'), ('itr_years_filed', 0),
+    ('avg_balance_to_emi_ratio_percent', 0), ('credit_history_score_choice', 'best_36m'),
+    ('business_turnover_annual', 0), ('income_trend', 'stable'),
+)
+
 @dataclass
 class Applicant:
     name: str
@@ -73,6 +109,13 @@ class Applicant:
     visit_verified: bool = False
     visit_remarks: Optional[str] = None
 
+    def __post_init__(self):
+        # blanks in the scoring-only fields stand for their neutral value; fill them once here so
+        # the scoring code reads the fields directly (a NaN experience is kept, it scores top band)
+        for field, blank in _APPLICANT_BLANK_DEFAULTS:
+            if not getattr(self, field):
+                setattr(self, field, blank)
+
 @dataclass
 class Decision:
     eligible: bool
@@ -85,26 +128,81 @@ class Decision:
     grade: Optional[int] = None
     details: Dict = None
 
-MARITAL_SCORE = {'single':3, 'married':5, 'divorced':1}
-AGE_SCORE = lambda age: 0 if age<=21 else (3 if age<=30 else (5 if age<=45 else (4 if age<=55 else 2)))
-DEPENDENT_SCORE = lambda d: 5 if d<2 else (4 if d<=3 else (3 if d<=5 else 1))
-BANK_REL_SCORE = lambda yrs: 1 if yrs==0 else (3 if yrs<5 else (4 if yrs<10 else 5))
-RESIDENCE_SCORE = {'rented':1, 'owned_non_metro':2, 'owned_metro':3, 'kaccha':1}
-YEARS_AT_ADDRESS_SCORE = lambda y: 0 if y<1 else (1 if y<=3 else 2)
-SPOUSE_INCOME_SCORE = lambda amt: 5 if amt>500000 else (4 if amt>300000 else (2 if amt>100000 else 0))
-DISPOSABLE_INCOME_SCORE = lambda monthly: 0 if monthly<=8000 else (2 if monthly<=15000 else (3 if monthly<=25000 else 5))
-EMI_NMI_SCORE = lambda pct: 10 if 20<=pct<=25 else (8 if 25<pct<=40 else (6 if 40<pct<=65 else 0))
-REPAYMENT_TYPE_SCORE = {'others':0, 'post_dated_cheques':2, 'nach_other_bank':3, 'si_bom':4, 'checkoff':5}
-ITR_SCORE = lambda years: 5 if years>=3 else (4 if years==2 else (3 if years==1 else 0))
-AVG_BALANCE_SCORE = lambda ratio_percent: 5 if ratio_percent>200 else (4 if ratio_percent>100 else (3 if ratio_percent>50 else 2))
-CIBIL_SCORE_SCORE = lambda s: 10 if s>=800 else (8 if s>=750 else (6 if s>=700 else (0 if s>600 else 3)))
-CREDIT_HISTORY_MAP = {'best_36m':10, 'no_overdues_12m_prior':6, 'less_6m_no_arrears':4, 'no_bureau_hit':3,
-                      'overdues_12m':2, 'less6m_with_arrears':0, 'weak_with_settlements':0}
-
-PROF_NETWORTH_SCORE = lambda ratio: 0 if ratio<0.5 else (3 if ratio<0.75 else 5)
-PROF_INCOME_TREND_SCORE = {'increasing':5, 'stable':2, 'unstable':1, 'decreasing':0}
-PROF_TURNOVER_SCORE = lambda t: 1 if t<50e5 else (2 if t<80e5 else (3 if t<120e5 else (4 if t<400e5 else 5)))
-PROF_ITR_SCORE = lambda yrs: 5 if yrs>=5 else (4 if yrs>=3 else (3 if yrs>=2 else 0))
+MARITAL_SCORE = MappingProxyType({'single':3, 'married':5, 'divorced':1})
+# Piecewise bands as (edges, points) looked up with a C-level bisect: bisect_left where a band's
+# upper bound is inclusive (<=), bisect_right where it is exclusive (<); nextafter moves the odd
+# boundary that is inclusive on the other side.
+_AGE_EDGES, _AGE_VALUES = (21, 30, 45, 55), (0, 3, 5, 4, 2)
+_DEPENDENT_EDGES, _DEPENDENT_VALUES = (2, math.nextafter(3, math.inf), math.nextafter(5, math.inf)), (5, 4, 3, 1)
+_BANK_REL_EDGES, _BANK_REL_VALUES = (0, math.nextafter(0, math.inf), 5, 10), (3, 1, 3, 4, 5)
+_YEARS_AT_ADDRESS_EDGES, _YEARS_AT_ADDRESS_VALUES = (1, math.nextafter(3, math.inf)), (0, 1, 2)
+_SPOUSE_INCOME_EDGES, _SPOUSE_INCOME_VALUES = (100000, 300000, 500000), (0, 2, 4, 5)
+_DISPOSABLE_INCOME_EDGES, _DISPOSABLE_INCOME_VALUES = (8000, 15000, 25000), (0, 2, 3, 5)
+_EMI_NMI_EDGES, _EMI_NMI_VALUES = (math.nextafter(20, -math.inf), 25, 40, 65), (0, 10, 8, 6, 0)
+# ITR years are whole numbers, so ==1 / ==2 are the bands [1, 2) / [2, 3)
+_ITR_EDGES, _ITR_VALUES = (1, 2, 3), (0, 3, 4, 5)
+_AVG_BALANCE_EDGES, _AVG_BALANCE_VALUES = (50, 100, 200), (2, 3, 4, 5)
+_CIBIL_EDGES, _CIBIL_VALUES = (math.nextafter(600, math.inf), 700, 750, 800), (3, 0, 6, 8, 10)
+_WORK_EXP_SAL_EDGES, _WORK_EXP_SAL_VALUES = (1, 3, 5), (0, 3, 4, 5)
+_WORK_EXP_PROF_EDGES, _WORK_EXP_PROF_VALUES = (2, 5, 7, 10), (0, 2, 3, 4, 5)
+_PROF_NETWORTH_EDGES, _PROF_NETWORTH_VALUES = (0.5, 0.75), (0, 3, 5)
+_PROF_TURNOVER_EDGES, _PROF_TURNOVER_VALUES = (50e5, 80e5, 120e5, 400e5), (1, 2, 3, 4, 5)
+_PROF_ITR_EDGES, _PROF_ITR_VALUES = (2, 3, 5), (0, 3, 4, 5)
+# grade 1 is strictly above 80, grades 2-4 start at 71 / 61 / 50 inclusive
+_GRADE_EDGES, _GRADE_VALUES = (50, 61, 71, math.nextafter(80, math.inf)), (5, 4, 3, 2, 1)
+
+def age_score(age):
+    return _AGE_VALUES[bisect_left(_AGE_EDGES, age)]
+def dependent_score(d):
+    return _DEPENDENT_VALUES[bisect_right(_DEPENDENT_EDGES, d)]
+def bank_rel_score(yrs):
+    return _BANK_REL_VALUES[bisect_right(_BANK_REL_EDGES, yrs)]
+RESIDENCE_SCORE = MappingProxyType({'rented':1, 'owned_non_metro':2, 'owned_metro':3, 'kaccha':1})
+def years_at_address_score(y):
+    return _YEARS_AT_ADDRESS_VALUES[bisect_right(_YEARS_AT_ADDRESS_EDGES, y)]
+def spouse_income_score(amt):
+    return _SPOUSE_INCOME_VALUES[bisect_left(_SPOUSE_INCOME_EDGES, amt)]
+def disposable_income_score(monthly):
+    return _DISPOSABLE_INCOME_VALUES[bisect_left(_DISPOSABLE_INCOME_EDGES, monthly)]
+def emi_nmi_score(pct):
+    return _EMI_NMI_VALUES[bisect_left(_EMI_NMI_EDGES, pct)]
+REPAYMENT_TYPE_SCORE = MappingProxyType({'others':0, 'post_dated_cheques':2, 'nach_other_bank':3, 'si_bom':4, 'checkoff':5})
+def itr_score(years):
+    return _ITR_VALUES[bisect_right(_ITR_EDGES, years)]
+def avg_balance_score(ratio_percent):
+    return _AVG_BALANCE_VALUES[bisect_left(_AVG_BALANCE_EDGES, ratio_percent)]
+def cibil_score_score(s):
+    return _CIBIL_VALUES[bisect_right(_CIBIL_EDGES, s)]
+CREDIT_HISTORY_MAP = MappingProxyType({'best_36m':10, 'no_overdues_12m_prior':6, 'less_6m_no_arrears':4, 'no_bureau_hit':3,
+                                        'overdues_12m':2, 'less6m_with_arrears':0, 'weak_with_settlements':0})
+
+def prof_networth_score(ratio):
+    return _PROF_NETWORTH_VALUES[bisect_right(_PROF_NETWORTH_EDGES, ratio)]
+PROF_INCOME_TREND_SCORE = MappingProxyType({'increasing':5, 'stable':2, 'unstable':1, 'decreasing':0})
+def prof_turnover_score(t):
+    return _PROF_TURNOVER_VALUES[bisect_right(_PROF_TURNOVER_EDGES, t)]
+def prof_itr_score(yrs):
+    return _PROF_ITR_VALUES[bisect_right(_PROF_ITR_EDGES, yrs)]
+def score_grade(score):
+    return _GRADE_VALUES[bisect_right(_GRADE_EDGES, score)]
+
+# The score bands above as arrays, looked up over whole columns with np.searchsorted.
+_AGE_BINS, _AGE_PTS = np.array(_AGE_EDGES), np.array(_AGE_VALUES)
+_DEPENDENT_BINS, _DEPENDENT_PTS = np.array(_DEPENDENT_EDGES), np.array(_DEPENDENT_VALUES)
+_BANK_REL_BINS, _BANK_REL_PTS = np.array(_BANK_REL_EDGES), np.array(_BANK_REL_VALUES)
+_YEARS_AT_ADDRESS_BINS, _YEARS_AT_ADDRESS_PTS = np.array(_YEARS_AT_ADDRESS_EDGES), np.array(_YEARS_AT_ADDRESS_VALUES)
+_SPOUSE_INCOME_BINS, _SPOUSE_INCOME_PTS = np.array(_SPOUSE_INCOME_EDGES), np.array(_SPOUSE_INCOME_VALUES)
+_DISPOSABLE_INCOME_BINS, _DISPOSABLE_INCOME_PTS = np.array(_DISPOSABLE_INCOME_EDGES), np.array(_DISPOSABLE_INCOME_VALUES)
+_EMI_NMI_BINS, _EMI_NMI_PTS = np.array(_EMI_NMI_EDGES), np.array(_EMI_NMI_VALUES)
+_ITR_BINS, _ITR_PTS = np.array(_ITR_EDGES), np.array(_ITR_VALUES)
+_AVG_BALANCE_BINS, _AVG_BALANCE_PTS = np.array(_AVG_BALANCE_EDGES), np.array(_AVG_BALANCE_VALUES)
+_CIBIL_BINS, _CIBIL_PTS = np.array(_CIBIL_EDGES), np.array(_CIBIL_VALUES)
+_WORK_EXP_SAL_BINS, _WORK_EXP_SAL_PTS = np.array(_WORK_EXP_SAL_EDGES), np.array(_WORK_EXP_SAL_VALUES)
+_WORK_EXP_PROF_BINS, _WORK_EXP_PROF_PTS = np.array(_WORK_EXP_PROF_EDGES), np.array(_WORK_EXP_PROF_VALUES)
+_PROF_NETWORTH_BINS, _PROF_NETWORTH_PTS = np.array(_PROF_NETWORTH_EDGES), np.array(_PROF_NETWORTH_VALUES)
+_PROF_TURNOVER_BINS, _PROF_TURNOVER_PTS = np.array(_PROF_TURNOVER_EDGES), np.array(_PROF_TURNOVER_VALUES)
+_PROF_ITR_BINS, _PROF_ITR_PTS = np.array(_PROF_ITR_EDGES), np.array(_PROF_ITR_VALUES)
+_GRADE_BINS, _GRADE_PTS = np.array(_GRADE_EDGES), np.array(_GRADE_VALUES)
 
 RATE_TABLE_SALARIED = {
     ('A','bom',800):0.70, ('A','bom',776):1.00, ('A','bom',750):1.50, ('A','bom',700):2.00, ('A','bom','ntc'):1.70,
@@ -115,107 +213,152 @@ RATE_TABLE_SALARIED = {
 }
 RATE_TABLE_PROF = {800:2.00, 776:2.50, 750:3.00, 700:3.50, 'ntc':2.75}
 
+# Numeric scoring cores for numba: plain floats in (categoricals already mapped to their points),
+# (score, grade) out. Only used when numba is installed; otherwise compute_score_* use the bisect bands.
+def _score_sal(age, we, marital_pts, deps, bank_yrs, res_pts, yrs_addr, spouse_inc, disp, emi_pct, rep_pts, itr, avg_bal, cibil, hist_pts):
+    score = 0.0 + 3 + 2
+    score += _WORK_EXP_SAL_PTS[np.searchsorted(_WORK_EXP_SAL_BINS, we, side='right')]
+    score += marital_pts
+    score += _AGE_PTS[np.searchsorted(_AGE_BINS, age, side='left')]
+    score += _DEPENDENT_PTS[np.searchsorted(_DEPENDENT_BINS, deps, side='right')]
+    score += _BANK_REL_PTS[np.searchsorted(_BANK_REL_BINS, bank_yrs, side='right')]
+    score += res_pts
+    score += _YEARS_AT_ADDRESS_PTS[np.searchsorted(_YEARS_AT_ADDRESS_BINS, yrs_addr, side='right')]
+    score += _SPOUSE_INCOME_PTS[np.searchsorted(_SPOUSE_INCOME_BINS, spouse_inc, side='left')]
+    score += _DISPOSABLE_INCOME_PTS[np.searchsorted(_DISPOSABLE_INCOME_BINS, disp, side='left')]
+    score += _EMI_NMI_PTS[np.searchsorted(_EMI_NMI_BINS, emi_pct, side='left')]
+    score += rep_pts
+    score += _ITR_PTS[np.searchsorted(_ITR_BINS, itr, side='right')]
+    score += _AVG_BALANCE_PTS[np.searchsorted(_AVG_BALANCE_BINS, avg_bal, side='left')]
+    score += _CIBIL_PTS[np.searchsorted(_CIBIL_BINS, cibil, side='right')]
+    score += hist_pts
+    score = min(score, 100.0)
+    grade = _GRADE_PTS[np.searchsorted(_GRADE_BINS, score, side='right')]
+    return score, grade
+
+def _score_prof(age, we, marital_pts, deps, bank_yrs, res_pts, yrs_addr, disp, emi_pct, networth_ratio, trend_pts, turnover, itr, avg_bal, cibil, hist_pts):
+    score = 0.0 + 3
+    score += _DEPENDENT_PTS[np.searchsorted(_DEPENDENT_BINS, deps, side='right')]
+    score += _WORK_EXP_PROF_PTS[np.searchsorted(_WORK_EXP_PROF_BINS, we, side='right')]
+    score += marital_pts
+    score += _AGE_PTS[np.searchsorted(_AGE_BINS, age, side='left')]
+    score += _BANK_REL_PTS[np.searchsorted(_BANK_REL_BINS, bank_yrs, side='right')] * (10/5)
+    score += res_pts
+    score += _YEARS_AT_ADDRESS_PTS[np.searchsorted(_YEARS_AT_ADDRESS_BINS, yrs_addr, side='right')]
+    score += _DISPOSABLE_INCOME_PTS[np.searchsorted(_DISPOSABLE_INCOME_BINS, disp, side='left')]
+    score += _EMI_NMI_PTS[np.searchsorted(_EMI_NMI_BINS, emi_pct, side='left')]
+    score += _PROF_NETWORTH_PTS[np.searchsorted(_PROF_NETWORTH_BINS, networth_ratio, side='right')]
+    score += trend_pts
+    score += _PROF_TURNOVER_PTS[np.searchsorted(_PROF_TURNOVER_BINS, turnover, side='right')]
+    score += _PROF_ITR_PTS[np.searchsorted(_PROF_ITR_BINS, itr, side='right')]
+    score += _AVG_BALANCE_PTS[np.searchsorted(_AVG_BALANCE_BINS, avg_bal, side='left')]
+    score += _CIBIL_PTS[np.searchsorted(_CIBIL_BINS, cibil, side='right')]
+    score += hist_pts
+    score = min(score, 100.0)
+    grade = _GRADE_PTS[np.searchsorted(_GRADE_BINS, score, side='right')]
+    return score, grade
+
+if _NUMBA_AVAILABLE:
+    _score_sal = njit(cache=True)(_score_sal)
+    _score_prof = njit(cache=True)(_score_prof)
+
+    # compile (or load from the on-disk cache) at startup rather than on the first evaluation
+    _score_sal(*(0.0,) * 15)
+    _score_prof(*(0.0,) * 16)
+
 def compute_score_salaried(app: Applicant) -> Tuple[float,int]:
+    if _NUMBA_AVAILABLE:
+        return _score_sal(
+            float(app.age), float(app.work_experience_years), float(MARITAL_SCORE.get(app.marital_status,3)),
+            float(app.dependents), float(app.bank_relationship_years), float(RESIDENCE_SCORE.get(app.residence_type,1)),
+            float(app.years_at_address), float(app.spouse_income_annual), float(app.disposable_monthly_income),
+            float(app.emi_nmi_ratio_percent), float(REPAYMENT_TYPE_SCORE.get(app.repayment_type,0)),
+            float(app.itr_years_filed), float(app.avg_balance_to_emi_ratio_percent), float(app.cibil_score or 0),
+            float(CREDIT_HISTORY_MAP.get(app.credit_history_score_choice,10)))
     score = 0.0
     score += 3
     score += 2
-    we = app.work_experience_years or 0
-    if we < 1:
-        we_pts = 0
-    elif we < 3:
-        we_pts = 3
-    elif we < 5:
-        we_pts = 4
-    else:
-        we_pts = 5
-    score += we_pts
-    score += MARITAL_SCORE.get(app.marital_status or 'single',3)
-    score += AGE_SCORE(app.age)
-    score += DEPENDENT_SCORE(app.dependents or 0)
-    score += BANK_REL_SCORE(app.bank_relationship_years or 0)
-    score += RESIDENCE_SCORE.get(app.residence_type or 'rented',1)
-    score += YEARS_AT_ADDRESS_SCORE(app.years_at_address or 0)
-    score += SPOUSE_INCOME_SCORE(app.spouse_income_annual or 0)
-    score += DISPOSABLE_INCOME_SCORE(app.disposable_monthly_income or 0)
-    score += EMI_NMI_SCORE(app.emi_nmi_ratio_percent or 0)
-    score += REPAYMENT_TYPE_SCORE.get(app.repayment_type or 'others',0)
-    score += ITR_SCORE(app.itr_years_filed or 0)
-    score += AVG_BALANCE_SCORE(app.avg_balance_to_emi_ratio_percent or 0)
-    score += CIBIL_SCORE_SCORE(app.cibil_score or 0)
-    score += CREDIT_HISTORY_MAP.get(app.credit_history_score_choice or 'best_36m',10)
+    score += _WORK_EXP_SAL_VALUES[bisect_right(_WORK_EXP_SAL_EDGES, app.work_experience_years)]
+    score += MARITAL_SCORE.get(app.marital_status,3)
+    score += age_score(app.age)
+    score += dependent_score(app.dependents)
+    score += bank_rel_score(app.bank_relationship_years)
+    score += RESIDENCE_SCORE.get(app.residence_type,1)
+    score += years_at_address_score(app.years_at_address)
+    score += spouse_income_score(app.spouse_income_annual)
+    score += disposable_income_score(app.disposable_monthly_income)
+    score += emi_nmi_score(app.emi_nmi_ratio_percent)
+    score += REPAYMENT_TYPE_SCORE.get(app.repayment_type,0)
+    score += itr_score(app.itr_years_filed)
+    score += avg_balance_score(app.avg_balance_to_emi_ratio_percent)
+    score += cibil_score_score(app.cibil_score or 0)
+    score += CREDIT_HISTORY_MAP.get(app.credit_history_score_choice,10)
     score = min(score, 100)
-    grade = 1 if score>80 else (2 if score>=71 else (3 if score>=61 else (4 if score>=50 else 5)))
+    grade = score_grade(score)
     return score, grade
 
 def compute_score_professional(app: Applicant) -> Tuple[float,int]:
+    if _NUMBA_AVAILABLE:
+        if app.proposed_loan_amount and app.net_worth is not None and app.proposed_loan_amount>0:
+            ratio = app.net_worth / app.proposed_loan_amount
+        else:
+            ratio = 0.0
+        return _score_prof(
+            float(app.age), float(app.work_experience_years), float(MARITAL_SCORE.get(app.marital_status,3)),
+            float(app.dependents), float(app.bank_relationship_years), float(RESIDENCE_SCORE.get(app.residence_type,1)),
+            float(app.years_at_address), float(app.disposable_monthly_income), float(app.emi_nmi_ratio_percent),
+            float(ratio), float(PROF_INCOME_TREND_SCORE.get(app.income_trend,2)), float(app.business_turnover_annual),
+            float(app.itr_years_filed), float(app.avg_balance_to_emi_ratio_percent), float(app.cibil_score or 0),
+            float(CREDIT_HISTORY_MAP.get(app.credit_history_score_choice,10)))
     score = 0.0
     score += 3
-    score += DEPENDENT_SCORE(app.dependents or 0)
-    we = app.work_experience_years or 0
-    if we < 2:
-        we_pts = 0
-    elif we < 5:
-        we_pts = 2
-    elif we < 7:
-        we_pts = 3
-    elif we < 10:
-        we_pts = 4
-    else:
-        we_pts = 5
-    score += we_pts
-    score += MARITAL_SCORE.get(app.marital_status or 'single',3)
-    score += AGE_SCORE(app.age)
-    score += BANK_REL_SCORE(app.bank_relationship_years or 0) * (10/5)
-    score += RESIDENCE_SCORE.get(app.residence_type or 'rented',1)
-    score += YEARS_AT_ADDRESS_SCORE(app.years_at_address or 0)
-    score += DISPOSABLE_INCOME_SCORE(app.disposable_monthly_income or 0)
-    score += EMI_NMI_SCORE(app.emi_nmi_ratio_percent or 0)
+    score += dependent_score(app.dependents)
+    score += _WORK_EXP_PROF_VALUES[bisect_right(_WORK_EXP_PROF_EDGES, app.work_experience_years)]
+    score += MARITAL_SCORE.get(app.marital_status,3)
+    score += age_score(app.age)
+    score += bank_rel_score(app.bank_relationship_years) * (10/5)
+    score += RESIDENCE_SCORE.get(app.residence_type,1)
+    score += years_at_address_score(app.years_at_address)
+    score += disposable_income_score(app.disposable_monthly_income)
+    score += emi_nmi_score(app.emi_nmi_ratio_percent)
     if app.proposed_loan_amount and app.net_worth is not None and app.proposed_loan_amount>0:
         ratio = app.net_worth / app.proposed_loan_amount
     else:
         ratio = 0.0
-    score += PROF_NETWORTH_SCORE(ratio)
-    score += PROF_INCOME_TREND_SCORE.get(app.income_trend or 'stable',2)
-    score += PROF_TURNOVER_SCORE(app.business_turnover_annual or 0)
-    score += PROF_ITR_SCORE(app.itr_years_filed or 0)
-    score += AVG_BALANCE_SCORE(app.avg_balance_to_emi_ratio_percent or 0)
-    score += CIBIL_SCORE_SCORE(app.cibil_score or 0)
-    score += CREDIT_HISTORY_MAP.get(app.credit_history_score_choice or 'best_36m',10)
+    score += prof_networth_score(ratio)
+    score += PROF_INCOME_TREND_SCORE.get(app.income_trend,2)
+    score += prof_turnover_score(app.business_turnover_annual)
+    score += prof_itr_score(app.itr_years_filed)
+    score += avg_balance_score(app.avg_balance_to_emi_ratio_percent)
+    score += cibil_score_score(app.cibil_score or 0)
+    score += CREDIT_HISTORY_MAP.get(app.credit_history_score_choice,10)
     score = min(score, 100)
-    grade = 1 if score>80 else (2 if score>=71 else (3 if score>=61 else (4 if score>=50 else 5)))
+    grade = score_grade(score)
     return score, grade
 
+@lru_cache(maxsize=64)
+def _rate_spread(applicant_type: str, category: Optional[str], channel: str, slab) -> float:
+    # at most a few dozen distinct keys, so repeat evaluations are a single cache hit
+    if applicant_type == 'salaried':
+        return RATE_TABLE_SALARIED.get((category or 'C', channel, slab), 3.5)
+    return RATE_TABLE_PROF.get(slab, RATE_TABLE_PROF.get('ntc', 2.75))
+
 def determine_interest_rate(app: Applicant, base_rllr_percent: float) -> float:
-    if app.applicant_type == 'salaried':
-        s = app.cibil_score or 0
-        if s>=800:
-            slab = 800
-        elif s>=776:
-            slab = 776
-        elif s>=750:
-            slab = 750
-        elif s>=700:
-            slab = 700
-        else:
-            slab = 'ntc'
-        key = (app.category or 'C', 'bom' if app.salary_account_with_bom else 'other', slab)
-        spread = RATE_TABLE_SALARIED.get(key, 3.5)
+    s = app.cibil_score or 0
+    if s>=800:
+        slab = 800
+    elif s>=776:
+        slab = 776
+    elif s>=750:
+        slab = 750
+    elif s>=700:
+        slab = 700
     else:
-        s = app.cibil_score or 0
-        if s>=800:
-            slab = 800
-        elif s>=776:
-            slab = 776
-        elif s>=750:
-            slab = 750
-        elif s>=700:
-            slab = 700
-        else:
-            slab = 'ntc'
-        spread = RATE_TABLE_PROF.get(slab, RATE_TABLE_PROF.get('ntc', 2.75))
-    return base_rllr_percent + spread
+        slab = 'ntc'
+    channel = 'bom' if app.salary_account_with_bom else 'other'
+    return base_rllr_percent + _rate_spread(app.applicant_type, app.category, channel, slab)
 
-def eligibility_and_recommendation(app: Applicant, base_rllr_percent: float) -> Decision:
+def _evaluate(app: Applicant, base_rllr_percent: float) -> Decision:
     if not (app.kyc_ok and app.payslips_ok and app.fraud_ok and app.bank_rel_ok and app.address_ok):
         return Decision(False, "Compliance check failed — complete KYC / payslips / fraud / bank relation / address verification.", details={
             'kyc_ok': app.kyc_ok, 'payslips_ok': app.payslips_ok, 'fraud_ok': app.fraud_ok, 'bank_rel_ok': app.bank_rel_ok, 'address_ok': app.address_ok
@@ -259,88 +402,366 @@ def eligibility_and_recommendation(app: Applicant, base_rllr_percent: float) ->
         'proposed_emi_pct': proposed_emi_pct
     })
 
-def generate_sanction_letter_pdf(applicant: Applicant, decision: Decision) -> bytes:
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
+# Every Applicant field except the free-text ones that never influence the decision.
+_DECISION_FIELDS = tuple(f for f in Applicant.__dataclass_fields__ if f not in ('name', 'visit_date', 'visit_remarks'))
+
+@lru_cache(maxsize=256)
+def _decide_core(base_rllr_percent: float, *fields) -> Tuple:
+    d = _evaluate(Applicant(name='', **dict(zip(_DECISION_FIELDS, fields))), base_rllr_percent)
+    details = tuple(d.details.items()) if d.details is not None else None
+    return d.eligible, d.reason, d.recommended_loan, d.tenure_months, d.annual_rate_percent, d.emi, d.score, d.grade, details
+
+def eligibility_and_recommendation(app: Applicant, base_rllr_percent: float) -> Decision:
+    # only the single-applicant form lands here (bulk goes through score_bulk); reruns of the same
+    # form inputs, e.g. from an unrelated widget, reuse the cached decision
+    *terms, details = _decide_core(base_rllr_percent, *(getattr(app, f) for f in _DECISION_FIELDS))
+    return Decision(*terms, details=dict(details) if details is not None else None)
+
+# ---------------------------
+# Vectorised bulk evaluation
+# ---------------------------
+_SLAB_BINS = np.array([700, 750, 776, 800])
+
+# RATE_TABLE_* as dense arrays: [category, channel, slab] with slab 0..4 = 800, 776, 750, 700, 'ntc'.
+# The extra last category row catches blank/unknown categories at the 3.5 default spread.
+_RATE_CATEGORIES, _RATE_CHANNELS, _RATE_SLABS = ('A', 'B', 'C'), ('bom', 'other'), (800, 776, 750, 700, 'ntc')
+
+@st.cache_resource
+def _rate_arrays() -> Tuple[np.ndarray, np.ndarray]:
+    # built once per server process instead of on every rerun; only ever read (indexed into)
+    sal = np.full((len(_RATE_CATEGORIES) + 1, len(_RATE_CHANNELS), len(_RATE_SLABS)), 3.5)
+    for (cat, channel, slab), spread in RATE_TABLE_SALARIED.items():
+        sal[_RATE_CATEGORIES.index(cat), _RATE_CHANNELS.index(channel), _RATE_SLABS.index(slab)] = spread
+    prof = np.array([RATE_TABLE_PROF.get(slab, RATE_TABLE_PROF.get('ntc', 2.75)) for slab in _RATE_SLABS])
+    return sal, prof
+
+RATE_ARR_SAL, RATE_ARR_PROF = _rate_arrays()
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _emi_scalar(principal, annual_rate_percent, months):
+        # emi_vec for one row, with the same operation order so both paths agree to the bit
+        if principal <= 0 or months <= 0:
+            return 0.0
+        r = annual_rate_percent / 100.0 / 12.0
+        if r == 0:
+            return principal / months
+        c = (1 + r) ** months
+        return principal * r * c / (c - 1)
+
+    # Bulk kernel: score, price and EMI for every gated row in one pass. Rows are independent, so
+    # prange spreads them over all cores outside the GIL. error_model='numpy' lets a zero income
+    # divide to inf/nan like the NumPy path instead of raising.
+    @njit(parallel=True, cache=True, error_model='numpy')
+    def _score_price_rows(salaried, age, we, marital_pts, deps, bank_yrs, res_pts, yrs_addr, spouse_inc, disp, emi_pct, rep_pts,
+                          itr, avg_bal, cibil, hist_pts, networth_ratio, trend_pts, turnover, gm, ga, proposed_in,
+                          cat_idx, bom, cat_a, rate_sal, rate_prof, base_rllr_percent):
+        n = age.shape[0]
+        score = np.empty(n)
+        grade = np.empty(n, dtype=np.int64)
+        eligible_amount = np.empty(n)
+        tenure_months = np.empty(n, dtype=np.int64)
+        ded_limit_pct = np.empty(n, dtype=np.int64)
+        annual_rate = np.empty(n)
+        proposed = np.empty(n)
+        proposed_emi_pct = np.empty(n)
+        gross_monthly = np.empty(n)
+        recommended = np.empty(n)
+        rec_emi = np.empty(n)
+        for i in prange(n):
+            slab = len(_RATE_SLABS) - 1 - np.searchsorted(_SLAB_BINS, cibil[i], side='right')
+            if salaried[i]:
+                score[i], grade[i] = _score_sal(age[i], we[i], marital_pts[i], deps[i], bank_yrs[i], res_pts[i], yrs_addr[i],
+                                                spouse_inc[i], disp[i], emi_pct[i], rep_pts[i], itr[i], avg_bal[i], cibil[i], hist_pts[i])
+                eligible_amount[i] = min(20 * gm[i], 20_00_000.0)
+                tenure_months[i] = 84 if (cat_a[i] and bom[i]) else 60
+                ded_limit_pct[i] = 65 if cat_a[i] else 60
+                spread = rate_sal[cat_idx[i], 0 if bom[i] else 1, slab]
+            else:
+                score[i], grade[i] = _score_prof(age[i], we[i], marital_pts[i], deps[i], bank_yrs[i], res_pts[i], yrs_addr[i],
+                                                 disp[i], emi_pct[i], networth_ratio[i], trend_pts[i], turnover[i], itr[i],
+                                                 avg_bal[i], cibil[i], hist_pts[i])
+                eligible_amount[i] = min(1.5 * ga[i], 20_00_000.0)
+                tenure_months[i] = 60
+                ded_limit_pct[i] = 60
+                spread = rate_prof[slab]
+            annual_rate[i] = base_rllr_percent + spread
+            proposed[i] = proposed_in[i] if proposed_in[i] != 0 else eligible_amount[i]
+            gross_monthly[i] = gm[i] if gm[i] != 0 else (ga[i] / 12 if ga[i] != 0 else 0.0)
+            proposed_emi_pct[i] = (_emi_scalar(proposed[i], annual_rate[i], float(tenure_months[i])) / gross_monthly[i]) * 100
+            recommended[i] = min(proposed[i], eligible_amount[i])
+            rec_emi[i] = _emi_scalar(recommended[i], annual_rate[i], float(tenure_months[i]))
+        return (score, grade, eligible_amount, tenure_months, ded_limit_pct, annual_rate, proposed, proposed_emi_pct,
+                gross_monthly, recommended, rec_emi)
+
+    _score_price_rows(np.zeros(0, dtype=np.bool_), *(np.zeros(0),) * 21, np.zeros(0, dtype=np.intp),
+                      np.zeros(0, dtype=np.bool_), np.zeros(0, dtype=np.bool_), RATE_ARR_SAL, RATE_ARR_PROF, 0.0)
+
+_COMPLIANCE_FAILED = "Compliance check failed — complete KYC / payslips / fraud / bank relation / address verification."
+_PSVR_FAILED = "PSVR incomplete or not satisfactory — cannot sanction until PSVR verified."
+
+def _band(bins: np.ndarray, pts: np.ndarray, x, side: str = 'right') -> np.ndarray:
+    return pts[np.searchsorted(bins, x, side=side)]
+
+def _col(df: pd.DataFrame, col: str, default: float = 0.0) -> np.ndarray:
+    # blank cells arrive as None; `or default` on the single path is a fillna here
+    return df[col].astype(float).fillna(default).to_numpy()
+
+def _flag(df: pd.DataFrame, col: str) -> np.ndarray:
+    return df[col].map(bool).to_numpy(dtype=bool)
+
+def _codes(df: pd.DataFrame, col: str, keys) -> np.ndarray:
+    # small-int code per row (position in keys), -1 for blank or unknown; strings are hashed once here
+    return pd.Index(list(keys)).get_indexer(df[col])
+
+def _points(df: pd.DataFrame, col: str, mapping, default: float) -> np.ndarray:
+    # the default sits last, so the -1 code of a blank or unknown value indexes it
+    pts = np.array([*mapping.values(), default], dtype=float)
+    return pts[_codes(df, col, mapping)]
+
+def _score_and_price(df: pd.DataFrame, salaried: np.ndarray, age: np.ndarray, cibil: np.ndarray,
+                     base_rllr_percent: float) -> Dict[str, np.ndarray]:
+    """Score, price and size the loan for rows that passed the compliance / PSVR / CIBIL / age gate."""
+    # a blank experience stays NaN, which sorts past every edge into the top band as on the single path
+    we = df['work_experience_years'].astype(float).to_numpy()
+    bank_yrs = _col(df, 'bank_relationship_years')
+    itr = _col(df, 'itr_years_filed')
+    deps = _col(df, 'dependents')
+    yrs_addr = _col(df, 'years_at_address')
+    spouse_inc = _col(df, 'spouse_income_annual')
+    disp = _col(df, 'disposable_monthly_income')
+    emi_pct = _col(df, 'emi_nmi_ratio_percent')
+    avg_bal = _col(df, 'avg_balance_to_emi_ratio_percent')
+    turnover = _col(df, 'business_turnover_annual')
+    marital_pts = _points(df, 'marital_status', MARITAL_SCORE, 3)
+    res_pts = _points(df, 'residence_type', RESIDENCE_SCORE, 1)
+    rep_pts = _points(df, 'repayment_type', REPAYMENT_TYPE_SCORE, 0)
+    trend_pts = _points(df, 'income_trend', PROF_INCOME_TREND_SCORE, 2)
+    hist_pts = _points(df, 'credit_history_score_choice', CREDIT_HISTORY_MAP, 10)
+    proposed_in = _col(df, 'proposed_loan_amount')
+    net_worth = df['net_worth'].astype(float).to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where((proposed_in > 0) & ~np.isnan(net_worth), net_worth / proposed_in, 0.0)
+    gm = _col(df, 'gross_monthly_income')
+    ga = _col(df, 'gross_annual_income')
+    bom = _flag(df, 'salary_account_with_bom')
+    cat_a = (df['category'] == 'A').to_numpy()
+    # unknown categories code to -1, the catch-all last row
+    cat_idx = _codes(df, 'category', _RATE_CATEGORIES)
+    if _NUMBA_AVAILABLE:
+        (score, grade, eligible_amount, tenure_months, ded_limit_pct, annual_rate, proposed, proposed_emi_pct,
+         gross_monthly, recommended, rec_emi) = _score_price_rows(
+            salaried, age, we, marital_pts, deps, bank_yrs, res_pts, yrs_addr, spouse_inc, disp, emi_pct, rep_pts, itr, avg_bal,
+            cibil, hist_pts, ratio, trend_pts, turnover, gm, ga, proposed_in, cat_idx, bom, cat_a,
+            RATE_ARR_SAL, RATE_ARR_PROF, base_rllr_percent)
+    else:
+        bank_pts = _band(_BANK_REL_BINS, _BANK_REL_PTS, bank_yrs)
+        common = (_band(_AGE_BINS, _AGE_PTS, age, 'left')
+                  + _band(_DEPENDENT_BINS, _DEPENDENT_PTS, deps)
+                  + marital_pts + res_pts
+                  + _band(_YEARS_AT_ADDRESS_BINS, _YEARS_AT_ADDRESS_PTS, yrs_addr)
+                  + _band(_DISPOSABLE_INCOME_BINS, _DISPOSABLE_INCOME_PTS, disp, 'left')
+                  + _band(_EMI_NMI_BINS, _EMI_NMI_PTS, emi_pct, 'left')
+                  + _band(_AVG_BALANCE_BINS, _AVG_BALANCE_PTS, avg_bal, 'left')
+                  + _band(_CIBIL_BINS, _CIBIL_PTS, cibil)
+                  + hist_pts)
+        sal_pts = (3 + 2 + _band(_WORK_EXP_SAL_BINS, _WORK_EXP_SAL_PTS, we) + bank_pts
+                   + _band(_SPOUSE_INCOME_BINS, _SPOUSE_INCOME_PTS, spouse_inc, 'left')
+                   + rep_pts
+                   + _band(_ITR_BINS, _ITR_PTS, itr))
+        prof_pts = (3 + _band(_WORK_EXP_PROF_BINS, _WORK_EXP_PROF_PTS, we) + bank_pts * (10/5)
+                    + _band(_PROF_NETWORTH_BINS, _PROF_NETWORTH_PTS, ratio)
+                    + trend_pts
+                    + _band(_PROF_TURNOVER_BINS, _PROF_TURNOVER_PTS, turnover)
+                    + _band(_PROF_ITR_BINS, _PROF_ITR_PTS, itr))
+        score = np.minimum(common + np.where(salaried, sal_pts, prof_pts), 100)
+        grade = _band(_GRADE_BINS, _GRADE_PTS, score)
+        eligible_amount = np.where(salaried, np.minimum(20 * gm, 20_00_000), np.minimum(1.5 * ga, 20_00_000))
+        tenure_months = np.where(salaried & cat_a & bom, 84, 60)
+        ded_limit_pct = np.where(salaried & cat_a, 65, 60)
+        proposed = np.where(proposed_in != 0, proposed_in, eligible_amount)
+        slab_idx = len(_RATE_SLABS) - 1 - np.searchsorted(_SLAB_BINS, cibil, side='right')
+        spread = np.where(salaried, RATE_ARR_SAL[cat_idx, (~bom).astype(int), slab_idx], RATE_ARR_PROF[slab_idx])
+        annual_rate = base_rllr_percent + spread
+        emi = emi_vec(proposed, annual_rate, tenure_months)
+        gross_monthly = np.where(gm != 0, gm, np.where(ga != 0, ga / 12, 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            proposed_emi_pct = (emi / gross_monthly) * 100
+        recommended = np.minimum(proposed, eligible_amount)
+        rec_emi = emi_vec(recommended, annual_rate, tenure_months)
+    return {'score': score, 'grade': grade, 'proposed': proposed, 'eligible_by_income': eligible_amount,
+            'tenure_months': tenure_months, 'ded_limit_pct': ded_limit_pct, 'annual_rate': annual_rate,
+            'proposed_emi_pct': proposed_emi_pct, 'gross_monthly': gross_monthly, 'recommended': recommended, 'emi': rec_emi}
+
+def score_bulk(df: pd.DataFrame, base_rllr_percent: float) -> pd.DataFrame:
+    """Evaluate every row of a parsed upload at once, following _evaluate's rules column by column.
+
+    Returns one row per applicant with the Decision fields plus the intermediate values
+    (stage, proposed, eligible_by_income, proposed_emi_pct, gross_monthly) needed to rebuild its details.
+    """
+    salaried = (df['applicant_type'] == 'salaried').to_numpy()
+    age = df['age'].astype(float).to_numpy()
+    cibil = _col(df, 'cibil_score')
+    compliant = (_flag(df, 'kyc_ok') & _flag(df, 'payslips_ok') & _flag(df, 'fraud_ok')
+                 & _flag(df, 'bank_rel_ok') & _flag(df, 'address_ok'))
+    # the first failing check wins, in the same order as _evaluate; rows stopped by these cheap
+    # checks never reach the scoring and EMI maths
+    stage = np.select([~compliant, ~_flag(df, 'visit_verified'), cibil < 700, salaried & ((age < 21) | (age > 58))],
+                      ['compliance', 'psvr', 'cibil', 'age'], default='ok')
+    live = stage == 'ok'
+    v = _score_and_price(df[live], salaried[live], age[live], cibil[live], base_rllr_percent)
+    stage[live] = np.select([v['gross_monthly'] <= 0, v['proposed_emi_pct'] > v['ded_limit_pct']], ['income', 'emi'], default='ok')
+    ok = stage == 'ok'
+    ok_live = ok[live]
+
+    def scatter(values, fill):
+        out = np.full(len(df), fill, dtype=np.result_type(values, fill))
+        out[live] = values
+        return out
+
+    grade = v['grade']
+    reason = np.empty(len(df), dtype=object)
+    reason[live] = np.where(grade == 1, "Clear sanction", np.where(grade <= 3, "Sanction with normal authority", "Requires higher authority/decline"))
+    reason[stage == 'compliance'] = _COMPLIANCE_FAILED
+    reason[stage == 'psvr'] = _PSVR_FAILED
+    m = stage == 'cibil'
+    reason[m] = "CIBIL score below cutoff 700. CIBIL=" + df['cibil_score'][m].map(str)
+    m = stage == 'age'
+    reason[m] = "Age not within allowed band for salaried (21-58). Age=" + df['age'][m].map(str)
+    reason[stage == 'income'] = "Insufficient income data to compute deduction norms."
+    m = stage[live] == 'emi'
+    reason[np.flatnonzero(live)[m]] = [f"Proposed EMI {p:.1f}% of gross monthly exceeds deduction norm {d}%."
+                                       for p, d in zip(v['proposed_emi_pct'][m], v['ded_limit_pct'][m])]
+    return pd.DataFrame({
+        'eligible': ok & scatter(grade <= 3, False),
+        'reason': reason,
+        'recommended_loan': scatter(np.where(ok_live, v['recommended'], 0.0), 0.0),
+        'tenure_months': scatter(np.where(ok_live, v['tenure_months'], 0), 0),
+        'annual_rate_percent': scatter(np.where(ok_live, v['annual_rate'], 0.0), 0.0),
+        'emi': scatter(np.where(ok_live, v['emi'], 0.0), 0.0),
+        'score': scatter(np.where(ok_live, v['score'], np.nan), np.nan),
+        'grade': scatter(np.where(ok_live, grade, 0), 0),
+        'stage': stage,
+        'proposed': scatter(v['proposed'], np.nan),
+        'eligible_by_income': scatter(v['eligible_by_income'], np.nan),
+        'proposed_emi_pct': scatter(v['proposed_emi_pct'], np.nan),
+        'gross_monthly': scatter(v['gross_monthly'], np.nan),
+    }, index=df.index)
+
+def _bulk_decision(app: Applicant, r) -> Decision:
+    """Rebuild the Decision _evaluate would have returned from one row of score_bulk."""
+    if r.stage == 'compliance':
+        return Decision(False, r.reason, details={'kyc_ok': app.kyc_ok, 'payslips_ok': app.payslips_ok, 'fraud_ok': app.fraud_ok,
+                                                  'bank_rel_ok': app.bank_rel_ok, 'address_ok': app.address_ok})
+    if r.stage == 'psvr':
+        return Decision(False, r.reason, details={'visit_verified': app.visit_verified, 'visit_officer': app.visit_officer})
+    if r.stage in ('cibil', 'age'):
+        return Decision(False, r.reason)
+    if r.stage == 'income':
+        return Decision(False, r.reason, details={'gross_monthly': float(r.gross_monthly)})
+    if r.stage == 'emi':
+        return Decision(False, r.reason, details={'proposed_emi_pct': float(r.proposed_emi_pct)})
+    return Decision(bool(r.eligible), r.reason, float(r.recommended_loan), int(r.tenure_months), float(r.annual_rate_percent),
+                    float(r.emi), float(r.score), int(r.grade), {
+                        'proposed': float(r.proposed),
+                        'eligible_by_income': float(r.eligible_by_income),
+                        'proposed_emi_pct': float(r.proposed_emi_pct)
+                    })
+
+_LETTER_FORM = "SanctionLetterChrome"
+_LETTER_DETAIL_LABELS = ("Loan Amount (Rs.)", "Tenure (months)", "Interest Rate (p.a.)", "EMI (Rs.)",
+                         "Credit Score", "Grade", "Sanction Type")
+_LETTER_CONDITIONS = [
+    "• Loan to be repaid in Equated Monthly Installments (EMIs) as per schedule.",
+    "• Salary account to be maintained with Bank of Maharashtra (if applicable).",
+    "• Insurance of borrower / collateral coverage to be ensured by borrower.",
+    "• All standard terms & conditions of the Personal Loan Scheme apply.",
+    "• This sanction is valid for 30 days from the date of issuance."
+]
+
+def _define_letter_form(c: canvas.Canvas) -> None:
+    # Everything on the letter that does not depend on the applicant, recorded once per document
+    # as a form XObject; each page then references it with a single doForm.
     width, height = A4
+    c.beginForm(_LETTER_FORM)
     c.setFont("Helvetica-Bold", 14)
     c.drawCentredString(width / 2, height - 60, "BANK OF MAHARASHTRA")
     c.setFont("Helvetica", 11)
     c.drawCentredString(width / 2, height - 80, "Sanction Letter - Personal Loan Scheme")
     c.line(50, height - 90, width - 50, height - 90)
-    y = height - 130
     c.setFont("Helvetica", 10)
-    today = date.today().strftime("%d %B %Y")
-    c.drawString(50, y, f"Date: {today}")
-    y -= 20
-    c.drawString(50, y, "To,")
-    y -= 15
-    c.drawString(70, y, f"{applicant.name}")
-    y -= 15
-    c.drawString(70, y, f"({applicant.applicant_type.capitalize()} Applicant)")
-    y -= 30
+    c.drawString(50, height - 150, "To,")
     c.setFont("Helvetica-Bold", 11)
-    c.drawString(50, y, "Subject: Sanction of Personal Loan")
-    y -= 25
+    c.drawString(50, height - 210, "Subject: Sanction of Personal Loan")
     c.setFont("Helvetica", 10)
-    c.drawString(50, y, f"Dear {applicant.name.split()[0]},")
-    y -= 20
     para = ("We are pleased to inform you that your application for a Personal Loan has been "
             "sanctioned as per the following terms and conditions:")
-    textobj = c.beginText(50, y)
+    textobj = c.beginText(50, height - 255)
     textobj.textLine(para)
     c.drawText(textobj)
-    y -= 40
     c.setFont("Helvetica-Bold", 10)
-    c.drawString(60, y, "Sanction Details:")
-    y -= 20
-    c.setFont("Helvetica", 10)
-    details = [
-        ("Loan Amount (Rs.)", f"{decision.recommended_loan:,.2f}"),
-        ("Tenure (months)", f"{decision.tenure_months}"),
-        ("Interest Rate (p.a.)", f"{decision.annual_rate_percent:.2f}%"),
-        ("EMI (Rs.)", f"{decision.emi:,.2f}"),
-        ("Credit Score", f"{decision.score:.1f}"),
-        ("Grade", f"{decision.grade}"),
-        ("Sanction Type", decision.reason),
-    ]
-    for k, v in details:
-        c.drawString(70, y, f"{k}:")
-        c.drawString(250, y, str(v))
-        y -= 15
-    y -= 15
+    c.drawString(60, height - 295, "Sanction Details:")
+    labels = c.beginText(70, height - 315)
+    labels.setFont("Helvetica", 10, leading=15)
+    labels.textLines([f"{k}:" for k in _LETTER_DETAIL_LABELS])
+    c.drawText(labels)
     c.setFont("Helvetica-Bold", 10)
-    c.drawString(60, y, "Conditions / Remarks:")
-    y -= 15
+    c.drawString(60, height - 435, "Conditions / Remarks:")
     c.setFont("Helvetica", 10)
-    conditions = [
-        "• Loan to be repaid in Equated Monthly Installments (EMIs) as per schedule.",
-        "• Salary account to be maintained with Bank of Maharashtra (if applicable).",
-        "• Insurance of borrower / collateral coverage to be ensured by borrower.",
-        "• All standard terms & conditions of the Personal Loan Scheme apply.",
-        "• This sanction is valid for 30 days from the date of issuance."
+    conditions = c.beginText(70, height - 450)
+    conditions.setFont("Helvetica", 10, leading=13)
+    conditions.textLines(_LETTER_CONDITIONS)
+    c.drawText(conditions)
+    c.drawString(50, height - 535, "Kindly contact your branch for documentation and disbursal formalities.")
+    c.drawString(50, height - 575, "Yours faithfully,")
+    c.drawString(50, height - 595, "Branch Manager / Sanctioning Authority")
+    c.line(50, height - 605, 250, height - 605)
+    c.drawString(50, height - 615, "Bank of Maharashtra")
+    c.endForm()
+
+def _draw_sanction_letter(c: canvas.Canvas, applicant: Applicant, decision: Decision, today: str) -> None:
+    width, height = A4
+    if not c.hasForm(_LETTER_FORM):
+        _define_letter_form(c)
+    c.doForm(_LETTER_FORM)
+    # all of the applicant's text goes into one text object (a single BT/ET block), repositioned per group
+    t = c.beginText(50, height - 130)
+    t.setFont("Helvetica", 10, leading=15)
+    t.textLine(f"Date: {today}")
+    t.setTextOrigin(70, height - 165)
+    t.textLine(f"{applicant.name}")
+    t.textLine(f"({str(applicant.applicant_type).capitalize()} Applicant)")
+    t.setTextOrigin(50, height - 235)
+    t.textLine(f"Dear {(str(applicant.name).split() or [''])[0]},")
+    values = [
+        f"{decision.recommended_loan:,.2f}",
+        f"{decision.tenure_months}",
+        f"{decision.annual_rate_percent:.2f}%",
+        f"{decision.emi:,.2f}",
+        f"{decision.score:.1f}",
+        f"{decision.grade}",
+        decision.reason,
     ]
-    for line in conditions:
-        c.drawString(70, y, line)
-        y -= 13
-    y -= 20
-    c.drawString(50, y, "Kindly contact your branch for documentation and disbursal formalities.")
-    y -= 40
-    c.drawString(50, y, "Yours faithfully,")
-    y -= 20
-    c.drawString(50, y, "Branch Manager / Sanctioning Authority")
-    y -= 10
-    c.line(50, y, 250, y)
-    y -= 10
-    c.drawString(50, y, "Bank of Maharashtra")
-    c.showPage()
-    c.save()
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
-    return pdf_bytes
+    t.setTextOrigin(250, height - 315)
+    t.textLines([str(v) for v in values])
+    c.drawText(t)
 
-def generate_annexure_json(applicant: Applicant, decision: Decision) -> str:
-    annexure = {
+def generate_sanction_letter_pdf(applicant: Applicant, decision: Decision) -> bytes:
+    return generate_sanction_letters_pdf([(applicant, decision)])
+
+def generate_sanction_letters_pdf(letters) -> bytes:
+    # one canvas for the whole batch: fonts and document state are set up once, one page per letter.
+    # ReportLab assembles the document in memory anyway, so take its bytes directly rather than
+    # copying them through an intermediate BytesIO.
+    c = canvas.Canvas(None, pagesize=A4)
+    today = date.today().strftime("%d %B %Y")
+    for applicant, decision in letters:
+        _draw_sanction_letter(c, applicant, decision, today)
+        c.showPage()
+    return c.getpdfdata()
+
+def build_annexure_dict(applicant: Applicant, decision: Decision) -> Dict:
+    return {
         "ApplicantName": applicant.name,
         "ApplicantType": applicant.applicant_type,
         "Age": applicant.age,
@@ -367,7 +788,75 @@ def generate_annexure_json(applicant: Applicant, decision: Decision) -> str:
         },
         "DecisionDetails": decision.details
     }
-    return json.dumps(annexure, indent=2, default=str)
+
+def _dumps_json(obj) -> str:
+    # orjson writes the same indented layout several times faster and handles numpy scalars itself
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+def generate_annexure_json(applicant: Applicant, decision: Decision) -> str:
+    return _dumps_json(build_annexure_dict(applicant, decision))
+
+# numeric CSV columns -> value used when the column is absent (None = optional, blank stays None)
+_CSV_INT_COLS = {'age': 30, 'cibil_score': None, 'dependents': 0, 'bank_relationship_years': 0,
+                 'years_at_address': 0, 'itr_years_filed': 0}
+_CSV_FLOAT_COLS = {'gross_monthly_income': None, 'gross_annual_income': None, 'work_experience_years': 0.0,
+                   'spouse_income_annual': 0.0, 'disposable_monthly_income': 0.0, 'emi_nmi_ratio_percent': 0.0,
+                   'avg_balance_to_emi_ratio_percent': 0.0, 'net_worth': None, 'proposed_loan_amount': None,
+                   'business_turnover_annual': None}
+# blanks in these cannot be turned into an int, so the row is skipped
+_CSV_REQUIRED_COLS = ['age', 'dependents', 'bank_relationship_years', 'years_at_address', 'itr_years_filed']
+_CSV_ZERO_IF_BLANK = ['spouse_income_annual', 'disposable_monthly_income', 'emi_nmi_ratio_percent', 'avg_balance_to_emi_ratio_percent']
+# remaining columns -> value used when the column is absent from the upload
+_CSV_COLUMN_DEFAULTS = {'applicant_type': 'salaried', 'salary_account_with_bom': False, 'category': 'C',
+                        'marital_status': None, 'residence_type': None, 'repayment_type': 'others',
+                        'credit_history_score_choice': 'best_36m', 'income_trend': None, 'kyc_ok': False,
+                        'payslips_ok': False, 'fraud_ok': False, 'bank_rel_ok': False, 'address_ok': False,
+                        'visit_officer': None, 'visit_date': None, 'visit_verified': False, 'visit_remarks': None}
+# free-text / categorical columns are read as strings rather than type-inferred
+_CSV_TEXT_COLS = ['name', 'applicant_type', 'category', 'marital_status', 'residence_type', 'repayment_type',
+                  'credit_history_score_choice', 'income_trend', 'visit_officer', 'visit_date', 'visit_remarks']
+_CSV_FIELDS = list(Applicant.__dataclass_fields__)
+_CSV_FLAG_COLS = ['salary_account_with_bom', 'kyc_ok', 'payslips_ok', 'fraud_ok', 'bank_rel_ok', 'address_ok', 'visit_verified']
+
+def _coerce_csv_numeric(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """Parse the numeric columns once per column; returns the frame and a mask of unparsable rows."""
+    defaults = {**_CSV_INT_COLS, **_CSV_FLOAT_COLS}
+    df = df.assign(**{c: v for c, v in defaults.items() if c not in df.columns})
+    raw = df[list(defaults)]
+    # astype(float): an upload with no data rows leaves the columns as object
+    num = raw.apply(pd.to_numeric, errors='coerce').astype(float)
+    bad = ((num.isna() & raw.notna()).any(axis=1) | np.isinf(num[list(_CSV_INT_COLS)]).any(axis=1)
+           | num[_CSV_REQUIRED_COLS].isna().any(axis=1))
+    num[_CSV_ZERO_IF_BLANK] = num[_CSV_ZERO_IF_BLANK].fillna(0.0)
+    ints = np.trunc(num[list(_CSV_INT_COLS)].mask(bad, 0.0)).astype('Int64')
+    num = ints.join(num[list(_CSV_FLOAT_COLS)]).astype(object)
+    df[num.columns] = num.where(num.notna(), None)
+    # a blank experience has always been passed through as NaN rather than None
+    df['work_experience_years'] = num['work_experience_years'].astype(float)
+    return df, bad
+
+def _results_csv(frame: pd.DataFrame) -> str:
+    # csv.writer over plain column lists; pandas' to_csv formats cell by cell through its own layer
+    buf = StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    writer.writerow(frame.columns)
+    writer.writerows(zip(*(frame[c].astype(object).where(frame[c].notna(), '').tolist() for c in frame.columns)))
+    return buf.getvalue()
+
+@st.cache_data
+def _sample_csv() -> str:
+    # the template never changes, so reruns (every widget event) reuse the serialised CSV
+    return pd.DataFrame([{
+        'name':'Rahul Sharma','applicant_type':'salaried','age':34,'gross_monthly_income':60000,'gross_annual_income':None,
+        'cibil_score':790,'salary_account_with_bom':True,'category':'A','work_experience_years':6,'marital_status':'married',
+        'dependents':1,'bank_relationship_years':4,'residence_type':'owned_non_metro','years_at_address':4,'spouse_income_annual':200000,
+        'disposable_monthly_income':20000,'emi_nmi_ratio_percent':20,'repayment_type':'si_bom','itr_years_filed':3,'avg_balance_to_emi_ratio_percent':150,
+        'credit_history_score_choice':'best_36m','net_worth':None,'proposed_loan_amount':800000,'business_turnover_annual':None,'income_trend':None,
+        'kyc_ok':True,'payslips_ok':True,'fraud_ok':True,'bank_rel_ok':True,'address_ok':True,'visit_officer':'Officer A','visit_date':'2025-11-01','visit_verified':True,'visit_remarks':'OK'
+    }]).to_csv(index=False)
 
 st.title("Mahabank — Personal Loan Decision Tool (with Compliance & PSVR)")
 st.markdown("Automated scoring and sanction recommendations as per the Mahabank Master Circular. Provide current RLLR in sidebar.")
@@ -525,79 +1014,49 @@ if mode == "Bulk CSV":
     uploaded = st.file_uploader("Upload CSV", type=["csv"])
     example_csv = st.checkbox("Show example template / download sample CSV")
     if example_csv:
-        sample = pd.DataFrame([{
-            'name':'Rahul Sharma','applicant_type':'salaried','age':34,'gross_monthly_income':60000,'gross_annual_income':None,
-            'cibil_score':790,'salary_account_with_bom':True,'category':'A','work_experience_years':6,'marital_status':'married',
-            'dependents':1,'bank_relationship_years':4,'residence_type':'owned_non_metro','years_at_address':4,'spouse_income_annual':200000,
-            'disposable_monthly_income':20000,'emi_nmi_ratio_percent':20,'repayment_type':'si_bom','itr_years_filed':3,'avg_balance_to_emi_ratio_percent':150,
-            'credit_history_score_choice':'best_36m','net_worth':None,'proposed_loan_amount':800000,'business_turnover_annual':None,'income_trend':None,
-            'kyc_ok':True,'payslips_ok':True,'fraud_ok':True,'bank_rel_ok':True,'address_ok':True,'visit_officer':'Officer A','visit_date':'2025-11-01','visit_verified':True,'visit_remarks':'OK'
-        }])
-        st.download_button("Download sample CSV", sample.to_csv(index=False), file_name="sample_applicants_with_checks.csv", mime="text/csv")
+        st.download_button("Download sample CSV", _sample_csv(), file_name="sample_applicants_with_checks.csv", mime="text/csv")
     if uploaded is not None:
-        df = pd.read_csv(uploaded)
+        df = pd.read_csv(uploaded, dtype=dict.fromkeys(_CSV_TEXT_COLS, str), na_values=['', 'NA', 'None'])
         st.write(f"Uploaded {len(df)} rows")
-        results = []
         annexures = []
-        for idx, row in df.iterrows():
-            try:
-                applicant = Applicant(
-                    name = row.get('name', f'row{idx}'),
-                    applicant_type = row.get('applicant_type','salaried'),
-                    age = int(row.get('age', 30)),
-                    gross_monthly_income = float(row['gross_monthly_income']) if not pd.isna(row.get('gross_monthly_income')) else None,
-                    gross_annual_income = float(row['gross_annual_income']) if not pd.isna(row.get('gross_annual_income')) else None,
-                    cibil_score = int(row['cibil_score']) if not pd.isna(row.get('cibil_score')) else None,
-                    salary_account_with_bom = bool(row.get('salary_account_with_bom', False)),
-                    category = row.get('category'),
-                    work_experience_years = float(row.get('work_experience_years',0)),
-                    marital_status = row.get('marital_status'),
-                    dependents = int(row.get('dependents',0)),
-                    bank_relationship_years = int(row.get('bank_relationship_years',0)),
-                    residence_type = row.get('residence_type'),
-                    years_at_address = int(row.get('years_at_address',0)),
-                    spouse_income_annual = float(row.get('spouse_income_annual',0)) if not pd.isna(row.get('spouse_income_annual')) else 0.0,
-                    disposable_monthly_income = float(row.get('disposable_monthly_income',0)) if not pd.isna(row.get('disposable_monthly_income')) else 0.0,
-                    emi_nmi_ratio_percent = float(row.get('emi_nmi_ratio_percent',0)) if not pd.isna(row.get('emi_nmi_ratio_percent')) else 0.0,
-                    repayment_type = row.get('repayment_type','others'),
-                    itr_years_filed = int(row.get('itr_years_filed',0)),
-                    avg_balance_to_emi_ratio_percent = float(row.get('avg_balance_to_emi_ratio_percent',0)) if not pd.isna(row.get('avg_balance_to_emi_ratio_percent')) else 0.0,
-                    credit_history_score_choice = row.get('credit_history_score_choice','best_36m'),
-                    net_worth = float(row.get('net_worth')) if not pd.isna(row.get('net_worth')) else None,
-                    proposed_loan_amount = float(row.get('proposed_loan_amount')) if not pd.isna(row.get('proposed_loan_amount')) else None,
-                    business_turnover_annual = float(row.get('business_turnover_annual')) if not pd.isna(row.get('business_turnover_annual')) else None,
-                    income_trend = row.get('income_trend'),
-                    kyc_ok = bool(row.get('kyc_ok', False)),
-                    payslips_ok = bool(row.get('payslips_ok', False)),
-                    fraud_ok = bool(row.get('fraud_ok', False)),
-                    bank_rel_ok = bool(row.get('bank_rel_ok', False)),
-                    address_ok = bool(row.get('address_ok', False)),
-                    visit_officer = row.get('visit_officer'),
-                    visit_date = row.get('visit_date'),
-                    visit_verified = bool(row.get('visit_verified', False)),
-                    visit_remarks = row.get('visit_remarks')
-                )
-            except Exception as e:
-                st.warning(f"Skipping row {idx} due to parsing error: {e}")
-                continue
-            dec = eligibility_and_recommendation(applicant, base_rllr)
-            results.append({
-                'name': applicant.name,
-                'type': applicant.applicant_type,
-                'score': dec.score,
-                'grade': dec.grade,
-                'eligible': dec.eligible,
-                'reason': dec.reason,
-                'recommended_loan': dec.recommended_loan,
-                'tenure_months': dec.tenure_months,
-                'annual_rate_percent': dec.annual_rate_percent,
-                'emi': dec.emi
-            })
-            annexures.append(json.loads(generate_annexure_json(applicant, dec)))
-        results_df = pd.DataFrame(results)
+        letters = []
+        df, unparsable = _coerce_csv_numeric(df)
+        for idx in df.index[unparsable]:
+            st.warning(f"Skipping row {idx} due to parsing error: missing or non-numeric value in a numeric column")
+        df = df[~unparsable]
+        if 'name' not in df.columns:
+            df['name'] = 'row' + df.index.astype(str)
+        df = df.assign(**{c: v for c, v in _CSV_COLUMN_DEFAULTS.items() if c not in df.columns})
+        decisions = score_bulk(df, base_rllr)
+        ok = decisions['stage'] == 'ok'
+        results_df = pd.DataFrame({
+            'name': df['name'],
+            'type': df['applicant_type'],
+            'score': decisions['score'].astype(object).where(ok, None),
+            'grade': decisions['grade'].astype(object).where(ok, None),
+            'eligible': decisions['eligible'],
+            'reason': decisions['reason'],
+            'recommended_loan': decisions['recommended_loan'],
+            'tenure_months': decisions['tenure_months'],
+            'annual_rate_percent': decisions['annual_rate_percent'],
+            'emi': decisions['emi'],
+        }).infer_objects().reset_index(drop=True)
+        # Applicant objects are only built for the per-applicant annexures and letters:
+        # flags and blanks are normalised once per column, then each row maps positionally onto the fields
+        records = df[_CSV_FIELDS].astype(object)
+        records[_CSV_FLAG_COLS] = records[_CSV_FLAG_COLS].map(bool)
+        records = records.where(records.notna(), None)
+        for values, r in zip(records.itertuples(index=False, name=None), decisions.itertuples(index=False)):
+            applicant = Applicant(*values)
+            dec = _bulk_decision(applicant, r)
+            annexures.append(build_annexure_dict(applicant, dec))
+            if dec.eligible:
+                letters.append((applicant, dec))
         st.dataframe(results_df)
-        st.download_button("Download results CSV", results_df.to_csv(index=False), file_name="personal_loan_decisions.csv", mime="text/csv")
-        st.download_button("Download annexures JSON (all)", json.dumps(annexures, indent=2), file_name="annexures_all.json", mime="application/json")
+        st.download_button("Download results CSV", _results_csv(results_df), file_name="personal_loan_decisions.csv", mime="text/csv")
+        st.download_button("Download annexures JSON (all)", _dumps_json(annexures), file_name="annexures_all.json", mime="application/json")
+        if letters:
+            st.download_button("📄 Download sanction letters (PDF, all eligible)", data=generate_sanction_letters_pdf(letters), file_name="Sanction_Letters_all.pdf", mime="application/pdf")
 
 st.markdown("---")
 st.caption("Reference implementation. Update RLLR/cutoffs/scoring if policy changes.")
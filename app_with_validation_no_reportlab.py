@@ -7,13 +7,22 @@
 #   streamlit run app_with_validation_no_reportlab.py
 
 import streamlit as st
-import pandas as pd
+import numpy as np
 import json
-from dataclasses import dataclass
-from typing import Optional, Dict, Tuple
+from functools import lru_cache
+from typing import NamedTuple, Optional, Dict, Tuple
 from datetime import date
 import html
+import operator
 
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; emi_amount stays plain Python without it
+    _NUMBA_AVAILABLE = False
+
+# called on every rerun on purpose: the page config travels with each run's messages, and the
+# call is one small protobuf (~17 us), so a session_state guard would save nothing measurable
 st.set_page_config(page_title="Mahabank - Personal Loan Decision Tool (HTML)", layout="wide")
 
 # ---------------------------
@@ -25,18 +34,75 @@ def emi_amount(principal: float, annual_rate_percent: float, months: int) -> flo
     r = annual_rate_percent / 100.0 / 12.0
     if r == 0:
         return principal / months
-    emi = principal * r * (1 + r) ** months / ((1 + r) ** months - 1)
+    # float exponent: under numba an integer power compiles to repeated multiplication,
+    # which drifts from pow() in the last bits
+    c = (1 + r) ** float(months)
+    emi = principal * r * c / (c - 1)
     return emi
 
+if _NUMBA_AVAILABLE:
+    emi_amount = njit(cache=True)(emi_amount)
+    # compile (or load from the on-disk cache) at startup rather than on the first evaluation;
+    # after the first run the cached machine code is loaded, not recompiled, so no AOT build step
+    emi_amount(0.0, 0.0, 0)
+
+    # Batch kernel: emi_amount for every row. Rows are independent, so prange spreads them over all
+    # cores outside the GIL; going through the scalar function keeps batch and single results equal.
+    @njit(parallel=True, cache=True)
+    def _emi_rows(principal, annual_rate_percent, months):
+        n = principal.shape[0]
+        emi = np.empty(n)
+        for i in prange(n):
+            emi[i] = emi_amount(principal[i], annual_rate_percent[i], months[i])
+        return emi
+
+    _emi_rows(np.zeros(0), np.zeros(0), np.zeros(0))
+
+def emi_amount_vec(principal, annual_rate_percent, months, paise: bool = False) -> np.ndarray:
+    # emi_amount over whole arrays (scenario grids, batches), including its zero-principal / zero-rate guards
+    if _NUMBA_AVAILABLE:
+        principal, annual_rate_percent, months = np.broadcast_arrays(
+            np.asarray(principal, dtype=float), np.asarray(annual_rate_percent, dtype=float), np.asarray(months, dtype=float))
+        emi = _emi_rows(principal.ravel(), annual_rate_percent.ravel(), months.ravel()).reshape(principal.shape)
+    else:
+        principal = np.asarray(principal, dtype=float)
+        r = np.asarray(annual_rate_percent, dtype=float) / 100.0 / 12.0
+        n = np.asarray(months, dtype=float)
+        # plain pow, as in emi_amount: exp(n * log1p(r)) is no faster here and changes nearly every result in the last bits
+        with np.errstate(over='ignore'):
+            c = (1 + r) ** n
+        # both arms are computed for every element and blended; their denominators are guarded (c - 1 is
+        # only 0 for a zero rate or tenure, a zero tenure divides by 1) so neither arm produces inf/nan
+        emi = np.where(r == 0, principal / np.where(n > 0, n, 1.0), principal * r * c / (c - 1 + (c == 1)))
+        emi = np.where((principal <= 0) | (n <= 0), 0.0, emi)
+    # paise=True leaves float space here: int64 paise, rounded half to even like rupees_to_paise
+    return np.rint(emi * 100).astype(np.int64) if paise else emi
+
+# ---------------------------
+# Helper: money in paise
+# ---------------------------
+# Amounts on Applicant / Decision are whole paise (int). EMI math runs in float rupees and is
+# rounded once on the way out: rupees_to_paise for one amount, emi_amount_vec(..., paise=True) for
+# arrays, Decision.from_rupees for a whole decision.
+def rupees_to_paise(rupees: float) -> int:
+    # round() on a float rounds half to even, the same rule np.rint applies in emi_amount_vec
+    return int(round(rupees * 100))
+
+def paise_to_rupees(paise: int) -> float:
+    # operator.index refuses a float, so rupees passed where paise belong raise a TypeError here
+    # instead of printing a letter 100x too small
+    return operator.index(paise) / 100
+
 # ---------------------------
 # Data models
 # ---------------------------
-@dataclass
-class Applicant:
+# NamedTuples: immutable and hashed by value like a frozen dataclass, but built by tuple.__new__
+# (no per-field object.__setattr__) and hashed as plain tuples for the st.cache_data keys.
+class Applicant(NamedTuple):
     name: str
     applicant_type: str
     age: int
-    gross_monthly_income: Optional[float] = None
+    gross_monthly_income: Optional[int] = None  # paise
     cibil_score: Optional[int] = None
     kyc_ok: bool = False
     payslips_ok: bool = False
@@ -45,32 +111,40 @@ class Applicant:
     address_ok: bool = False
     visit_verified: bool = False
 
-@dataclass
-class Decision:
+class Decision(NamedTuple):
     eligible: bool
     reason: str
-    recommended_loan: float = 0.0
+    recommended_loan: int = 0  # paise
     tenure_months: int = 0
     annual_rate_percent: float = 0.0
-    emi: float = 0.0
+    emi: int = 0  # paise
     score: Optional[float] = None
     grade: Optional[int] = None
 
+    @classmethod
+    def from_rupees(cls, eligible: bool, reason: str, recommended_loan: float = 0.0, tenure_months: int = 0,
+                    annual_rate_percent: float = 0.0, emi: float = 0.0, score: Optional[float] = None,
+                    grade: Optional[int] = None) -> "Decision":
+        # how a Decision is built from emi_amount / eligibility math, which works in float rupees
+        return cls(eligible, reason, rupees_to_paise(recommended_loan), tenure_months, annual_rate_percent,
+                   rupees_to_paise(emi), score, grade)
+
 
 # ---------------------------
 # Generate sanction letter HTML (print to PDF)
 # ---------------------------
-def generate_sanction_letter_html(applicant: Applicant, decision: Decision) -> str:
-    today = date.today().strftime("%d %B %Y")
-    name = html.escape(applicant.name)
-    return f"""<!doctype html><html><head><meta charset='utf-8'><title>Sanction Letter - {name}</title>
-    <style>
-        body{{font-family:Arial;margin:40px;color:#111}}
-        .header{{text-align:center}}
-        h1{{font-size:18pt}}
-        table{{width:100%;border-collapse:collapse;margin-top:20px}}
-        td{{padding:6px 8px}}
-    </style></head>
+# The letter is static head and foot around a body with {...} slots; only the body goes
+# through the formatter, the CSS and the closing boilerplate are joined in as they are.
+_LETTER_CSS = """
+        body{font-family:Arial;margin:40px;color:#111}
+        .header{text-align:center}
+        h1{font-size:18pt}
+        table{width:100%;border-collapse:collapse;margin-top:20px}
+        td{padding:6px 8px}
+    """
+_LETTER_HEAD = "<!doctype html><html><head><meta charset='utf-8'><title>Sanction Letter - "
+_LETTER_STYLE = "</title>\n    <style>" + _LETTER_CSS + "</style></head>"
+_LETTER_BODY = """
     <body>
         <div class='header'>
             <h1>BANK OF MAHARASHTRA</h1>
@@ -78,7 +152,72 @@ def generate_sanction_letter_html(applicant: Applicant, decision: Decision) -> s
             <hr>
         </div>
         <p>Date: {today}</p>
-        <p>To,<br><b>{name}</b><br>({applicant.applicant_type.capitalize()} Applicant)</p>
+        <p>To,<br><b>{name}</b><br>({applicant_type} Applicant)</p>
         <p><b>Subject:</b> Sanction of Personal Loan</p>
-        <p>Dear {name.split()[0]},</p>
-        <p>We are pleased to inform you that yo
+        <p>Dear {first_name},</p>
+        <p>We are pleased to inform you that your application for a Personal Loan has been sanctioned as per the following terms and conditions:</p>
+        <h4>Sanction Details:</h4>
+        <table>
+            <tr><td>Loan Amount (Rs.)</td><td>{loan:,.2f}</td></tr>
+            <tr><td>Tenure (months)</td><td>{tenure}</td></tr>
+            <tr><td>Interest Rate (p.a.)</td><td>{rate:.2f}%</td></tr>
+            <tr><td>EMI (Rs.)</td><td>{emi:,.2f}</td></tr>
+            <tr><td>Credit Score</td><td>{score}</td></tr>
+            <tr><td>Grade</td><td>{grade}</td></tr>
+            <tr><td>Sanction Type</td><td>{reason}</td></tr>
+        </table>"""
+_LETTER_FOOT = """
+        <h4>Conditions / Remarks:</h4>
+        <ul>
+            <li>Loan to be repaid in Equated Monthly Installments (EMIs) as per schedule.</li>
+            <li>Salary account to be maintained with Bank of Maharashtra (if applicable).</li>
+            <li>Insurance of borrower / collateral coverage to be ensured by borrower.</li>
+            <li>All standard terms &amp; conditions of the Personal Loan Scheme apply.</li>
+            <li>This sanction is valid for 30 days from the date of issuance.</li>
+        </ul>
+        <p>Kindly contact your branch for documentation and disbursal formalities.</p>
+        <p>Yours faithfully,<br><br><br>Branch Manager / Sanctioning Authority<br>Bank of Maharashtra</p>
+    </body></html>"""
+
+class _LetterFields(dict):
+    # format_map source for _LETTER_BODY: a field that is not filled in renders blank
+    def __missing__(self, key):
+        return ""
+
+@st.cache_data(max_entries=128)
+def _render_sanction_letter_html(applicant: Applicant, decision: Decision, today: str) -> str:
+    # html.escape is five C-level str.replace passes, several times faster on names than a
+    # str.translate table, which maps through a Python dict per character
+    name = html.escape(applicant.name)
+    # partition stops at the first space without building a list; lstrip keeps a leading space from
+    # leaving the greeting empty. A blank name greets with an empty first name.
+    first_name = name.lstrip().partition(' ')[0]
+    applicant_type = applicant.applicant_type.capitalize()
+    fields = _LetterFields(
+        name=name,
+        today=today,
+        applicant_type=applicant_type,
+        first_name=first_name,
+        loan=paise_to_rupees(decision.recommended_loan),
+        tenure=decision.tenure_months,
+        rate=decision.annual_rate_percent,
+        emi=paise_to_rupees(decision.emi),
+        reason=html.escape(decision.reason),
+    )
+    # a decision without a score or grade leaves those slots to __missing__
+    if decision.score is not None:
+        fields['score'] = f"{decision.score:.1f}"
+    if decision.grade is not None:
+        fields['grade'] = decision.grade
+    body = _LETTER_BODY.format_map(fields)
+    return "".join([_LETTER_HEAD, name, _LETTER_STYLE, body, _LETTER_FOOT])
+
+@lru_cache(maxsize=1)
+def _letter_date(day: date) -> str:
+    # keyed on the day itself rather than a TTL, so the date turns over exactly at midnight
+    return day.strftime("%d %B %Y")
+
+def generate_sanction_letter_html(applicant: Applicant, decision: Decision) -> str:
+    # reruns with the same applicant and decision reuse the rendered letter; the date is part of
+    # the key so a letter cached yesterday is not served with yesterday's date
+    return _render_sanction_letter_html(applicant, decision, _letter_date(date.today()))